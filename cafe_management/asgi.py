@@ -0,0 +1,110 @@
+"""비동기 모드 (ASGI 서버용 진입점)
+
+실행 예시:
+    uvicorn asgi:asgi_app --host 0.0.0.0 --port 8000
+
+키오스크/대시보드가 주기적으로 호출하는 피드는 이벤트 루프에서 바로 처리하고,
+서버 시작 시 만든 매장 DB별 aiosqlite 커넥션 풀(ASYNC_DB_POOL_SIZE + ASYNC_DB_MAX_OVERFLOW개)로 조회합니다.
+- GET /user/api/menu/search     메뉴 검색 (Flask 뷰와 같은 메뉴 캐시 사용)
+- GET /admin/get_recent_orders  최근 주문 (관리자)
+
+그 밖의 페이지(메뉴 화면, 장바구니/주문, 관리자 화면, 내보내기)는 세션 저장, flash, 템플릿이 필요하므로
+Flask 앱을 a2wsgi 스레드 풀(ASGI_WSGI_THREADS개)에서 그대로 실행합니다.
+피드는 세션을 읽기만 하며(현재 매장, 관리자 로그인), 세션 쿠키가 있을 때만 세션 파일을 읽습니다.
+?store=로 매장을 바꾸는 것은 페이지 요청에서만 저장됩니다.
+"""
+from contextlib import asynccontextmanager
+
+import anyio
+from a2wsgi import WSGIMiddleware
+from flask import g
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, PlainTextResponse, RedirectResponse
+from starlette.routing import Mount, Route
+
+from app import create_app
+from menu_cache import get_menu_cache
+from routes.orders import recent_orders_response, recent_orders_stmt
+from routes.user import menu_search_response
+from stores import store_engine, store_names, upgrade_stores
+
+def create_asgi_app(flask_app=None):
+    """Flask 앱과 비동기 피드를 묶은 ASGI 앱"""
+    flask_app = flask_app or create_app()
+    config = flask_app.config
+    engines = {}
+
+    @asynccontextmanager
+    async def lifespan(app):
+        """시작 시 스키마 업그레이드 후 매장 DB별 커넥션 풀 생성, 종료 시 정리"""
+        def prepare():
+            with flask_app.app_context():
+                upgrade_stores()
+                return {store_id: store_engine(store_id).url for store_id in store_names()}
+
+        pools = {}
+        for store_id, url in (await anyio.to_thread.run_sync(prepare)).items():
+            # 매장 DB를 분리하지 않으면 모든 매장이 풀 하나를 공유
+            if url not in pools:
+                pools[url] = create_async_engine(
+                    url.set(drivername='sqlite+aiosqlite'),
+                    pool_size=config['ASYNC_DB_POOL_SIZE'],
+                    max_overflow=config['ASYNC_DB_MAX_OVERFLOW'],
+                )
+            engines[store_id] = pools[url]
+        try:
+            yield
+        finally:
+            engines.clear()
+            for engine in pools.values():
+                await engine.dispose()
+
+    async def read_session(request):
+        """(현재 매장 ID, 관리자 로그인 여부) - 매장 선택 규칙은 stores.select_store와 같음"""
+        data = {}
+        if config['SESSION_COOKIE_NAME'] in request.cookies:
+            environ = {'REQUEST_METHOD': 'GET', 'HTTP_COOKIE': request.headers.get('cookie', '')}
+            data = await anyio.to_thread.run_sync(
+                flask_app.session_interface.open_session, flask_app, flask_app.request_class(environ)
+            ) or {}
+        store_id = request.query_params.get('store')
+        if store_id is None:
+            store_id = data.get('store_id')
+            if store_id not in engines:
+                store_id = config['DEFAULT_STORE']
+        return store_id, bool(data.get('admin_logged_in'))
+
+    async def search_menu(request):
+        """메뉴 검색 API"""
+        store_id, _ = await read_session(request)
+        if store_id not in engines:
+            return PlainTextResponse('Not Found', status_code=404)
+        with flask_app.app_context():
+            g.store_id = store_id
+            cache = get_menu_cache()
+        async with AsyncSession(engines[store_id]) as session:
+            snapshot = await cache.aget(session)
+        return JSONResponse(menu_search_response(snapshot, request.query_params))
+
+    async def get_recent_orders(request):
+        """최근 주문 조회 (관리자)"""
+        store_id, admin_logged_in = await read_session(request)
+        if not admin_logged_in:
+            return RedirectResponse(flask_app.url_map.bind('').build('admin.admin_login'), status_code=302)
+        if store_id not in engines:
+            return PlainTextResponse('Not Found', status_code=404)
+        try:
+            async with AsyncSession(engines[store_id]) as session:
+                orders = (await session.execute(recent_orders_stmt(store_id))).scalars().all()
+            return JSONResponse(recent_orders_response(orders))
+        except Exception as e:
+            return JSONResponse({'success': False, 'error': str(e)})
+
+    return Starlette(routes=[
+        Route('/user/api/menu/search', search_menu),
+        Route('/admin/get_recent_orders', get_recent_orders),
+        Mount('/', app=WSGIMiddleware(flask_app, workers=config['ASGI_WSGI_THREADS'])),
+    ], lifespan=lifespan)
+
+asgi_app = create_asgi_app()
@@ -0,0 +1,55 @@
+"""앱 콜드 스타트 시간 / 워커당 RSS 측정
+
+실행 예시 (cafe_management 폴더에서):
+    python benchmarks/startup_benchmark.py --runs 10
+
+--eager-pandas 옵션을 주면 예전처럼 pandas를 앱 생성 전에 임포트한 경우와 비교할 수 있습니다.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD_SCRIPT = """
+import resource, sys, time
+start = time.perf_counter()
+if {eager_pandas}:
+    import pandas
+from app import create_app
+create_app()
+elapsed = time.perf_counter() - start
+rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(f"{{elapsed:.6f}} {{rss_kb}} {{int('pandas' in sys.modules)}}")
+"""
+
+def measure(runs, eager_pandas):
+    """자식 프로세스를 새로 띄워 runs번 측정"""
+    script = CHILD_SCRIPT.format(eager_pandas=eager_pandas)
+    times, rss = [], []
+    pandas_loaded = False
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, '-c', script], cwd=APP_DIR,
+                             capture_output=True, text=True, check=True).stdout.split()
+        times.append(float(out[0]))
+        rss.append(int(out[1]))
+        pandas_loaded = out[2] == '1'
+    return times, rss, pandas_loaded
+
+def main():
+    parser = argparse.ArgumentParser(description='앱 콜드 스타트 벤치마크')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--eager-pandas', action='store_true', help='pandas를 미리 임포트 (이전 동작 비교용)')
+    args = parser.parse_args()
+
+    modes = [False, True] if args.eager_pandas else [False]
+    for eager in modes:
+        times, rss, pandas_loaded = measure(args.runs, eager)
+        label = 'eager pandas' if eager else 'lazy imports'
+        print(f"[{label}] 시작 시간 중앙값 {statistics.median(times) * 1000:.1f}ms, "
+              f"최대 RSS 중앙값 {statistics.median(rss) / 1024:.1f}MB, pandas 로드: {pandas_loaded}")
+
+if __name__ == '__main__':
+    main()
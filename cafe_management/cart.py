@@ -0,0 +1,52 @@
+"""세션 장바구니
+
+장바구니는 세션에 [메뉴 id, 수량, 온도 코드, 요청사항] 목록으로만 저장하고,
+메뉴 이름/가격/소계는 화면을 그리거나 주문할 때 메뉴 캐시에서 채웁니다.
+"""
+from flask import session
+
+# 온도 -> 세션에 저장하는 한 글자 코드
+TEMPERATURE_CODES = {'hot': 'h', 'ice': 'i', 'none': 'n'}
+TEMPERATURES = {code: temperature for temperature, code in TEMPERATURE_CODES.items()}
+
+def encode_item(menu_id, quantity, temperature, special_request):
+    """장바구니 항목 1개 -> 세션 저장 형식"""
+    return [menu_id, quantity, TEMPERATURE_CODES.get(temperature, ''), special_request or '']
+
+def get_cart():
+    """세션의 장바구니 [[메뉴 id, 수량, 온도 코드, 요청사항], ...]"""
+    cart = session.get('cart', [])
+    # 이전 형식(항목마다 이름/가격을 담은 dict)으로 저장된 세션 호환
+    return [encode_item(item['menu_id'], item['quantity'], item['temperature'], item['special_request'])
+            if isinstance(item, dict) else item
+            for item in cart]
+
+def save_cart(cart):
+    """장바구니 저장"""
+    session['cart'] = cart
+
+def cart_count():
+    """장바구니 아이템 수 (항목을 변환하지 않고 목록 길이만 셈)"""
+    return len(session.get('cart', []))
+
+def resolve_cart(cart, snapshot):
+    """장바구니 -> 화면/주문용 항목 목록 (메뉴 이름/가격은 메뉴 스냅샷 기준)
+
+    삭제되었거나 다른 매장의 메뉴는 빠집니다.
+    반환: [{'menu_id', 'menu_name', 'price', 'quantity', 'temperature', 'special_request', 'subtotal'}, ...]
+    """
+    items = []
+    for menu_id, quantity, code, special_request in cart:
+        menu = snapshot.by_id.get(menu_id)
+        if menu is None:
+            continue
+        items.append({
+            'menu_id': menu_id,
+            'menu_name': menu.name,
+            'price': menu.price,
+            'quantity': quantity,
+            'temperature': TEMPERATURES.get(code, ''),
+            'special_request': special_request,
+            'subtotal': quantity * menu.price,
+        })
+    return items
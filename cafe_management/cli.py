@@ -0,0 +1,250 @@
+"""관리용 CLI 명령어
+
+사용 예시 (cafe_management 폴더에서):
+    flask --app app db upgrade          # 스키마 마이그레이션 적용
+    flask --app app db status           # 적용/대기 중인 마이그레이션 확인
+    flask --app app db init             # 마이그레이션 적용 + 기본 메뉴 등록
+    flask --app app db seed --menus 500 --orders 100000   # 성능 테스트용 대량 데이터 생성
+    flask --app app db seed --store gangnam                # 특정 매장에 생성 (기본값: DEFAULT_STORE)
+    flask --app app events replay       # 주문 이벤트 로그와 DB 비교
+    flask --app app events replay --apply-status --rollups # 로그 기준으로 주문 상태 복구 + 일별 매출 재계산
+
+매장별 DB 분리(STORE_SHARDING) 시 upgrade/status는 모든 매장 DB를 대상으로 합니다.
+"""
+import random
+from datetime import datetime, timedelta
+
+import click
+from flask import g
+from flask.cli import AppGroup
+from sqlalchemy import func, insert, select
+
+from events import ORDER_DELETED, STATUS_CHANGED, get_event_log, record_event, replay
+from models import db, Menu, Order, OrderItem
+from migrations import MIGRATIONS, current_version, pending_migrations
+from order_actions import change_order_status, remove_order
+from rollups import rebuild_daily_sales, refresh_daily_sales
+from stores import current_store, store_names, store_shards, upgrade_stores
+
+db_cli = AppGroup('db', help='데이터베이스 마이그레이션/시딩 명령어')
+events_cli = AppGroup('events', help='주문 이벤트 로그 명령어')
+
+SAMPLE_MENUS = [
+    dict(name='아메리카노', category='커피', price=4000, description='깔끔한 맛의 아메리카노', temperature_option='both', display_order=1),
+    dict(name='카페라떼', category='커피', price=4500, description='부드러운 우유가 들어간 라떼', temperature_option='both', display_order=2),
+    dict(name='카푸치노', category='커피', price=4500, description='풍부한 거품의 카푸치노', temperature_option='both', display_order=3),
+    dict(name='녹차라떼', category='차', price=4000, description='진한 녹차의 맛', temperature_option='both', display_order=4),
+    dict(name='치즈케이크', category='디저트', price=5000, description='부드러운 치즈케이크', temperature_option='none', display_order=5),
+    dict(name='초콜릿 머핀', category='디저트', price=3500, description='달콤한 초콜릿 머핀', temperature_option='none', display_order=6),
+]
+
+# 시딩용 메뉴 이름 조합 (기본 이름 -> 카테고리, 온도 옵션)
+SEED_BASES = {
+    '라떼': ('커피', 'both'), '아메리카노': ('커피', 'both'), '콜드브루': ('커피', 'ice'),
+    '티': ('차', 'both'), '에이드': ('음료', 'ice'), '스무디': ('음료', 'ice'),
+    '케이크': ('디저트', 'none'), '쿠키': ('디저트', 'none'), '크로플': ('디저트', 'none'),
+}
+SEED_FLAVORS = ['바닐라', '헤이즐넛', '카라멜', '말차', '흑당', '딸기', '자몽', '유자', '초코', '시나몬', '레몬', '복숭아']
+SEED_STATUSES = ['completed'] * 8 + ['cancelled', 'pending']
+SEED_LOCATIONS = ['1층 로비', '2층 회의실', '3층 사무실', '4층 라운지', '테이크아웃']
+SEED_NAMES = ['김민준', '이서연', '박지호', '최수아', '정예준', '강하은', '조도윤', '윤지우']
+
+def use_store(store_id):
+    """CLI 명령어의 대상 매장 지정 (None이면 기본 매장)"""
+    if store_id is not None:
+        if store_id not in store_names():
+            raise click.BadParameter(f'등록되지 않은 매장입니다: {store_id}', param_hint='--store')
+        g.store_id = store_id
+
+def seed_sample_menus():
+    """현재 매장에 기본 메뉴 등록 (메뉴가 하나도 없을 때만)"""
+    store_id = current_store()
+    if Menu.query.filter_by(store_id=store_id).count() == 0:
+        db.session.execute(insert(Menu), [dict(menu, store_id=store_id) for menu in SAMPLE_MENUS])
+        db.session.commit()
+        return len(SAMPLE_MENUS)
+    return 0
+
+@db_cli.command('upgrade')
+@click.option('--target', type=int, default=None, help='이 버전까지만 적용')
+def upgrade_command(target):
+    """대기 중인 마이그레이션 적용 (모든 매장 DB)"""
+    for store_ids, applied in upgrade_stores(target=target):
+        click.echo(f'[{", ".join(store_ids)}]')
+        for version, description in applied:
+            click.echo(f'  적용: {version:04d} {description}')
+        click.echo(f'마이그레이션 {len(applied)}개 적용 완료')
+
+@db_cli.command('status')
+def status_command():
+    """마이그레이션 적용 현황 (모든 매장 DB)"""
+    for engine, store_ids in store_shards():
+        with engine.begin() as conn:
+            version = current_version(conn)
+        pending = {m[0] for m in pending_migrations(engine)}
+        click.echo(f'[{", ".join(store_ids)}] 현재 스키마 버전: {version}')
+        for number, description, _ in MIGRATIONS:
+            mark = '대기' if number in pending else '적용'
+            click.echo(f'  [{mark}] {number:04d} {description}')
+
+@db_cli.command('init')
+@click.option('--store', default=None, help='기본 메뉴를 등록할 매장 ID (기본값: DEFAULT_STORE)')
+def init_command(store):
+    """마이그레이션 적용 후 기본 메뉴 등록"""
+    use_store(store)
+    upgrade_stores()
+    added = seed_sample_menus()
+    click.echo(f'데이터베이스가 초기화되었습니다. (기본 메뉴 {added}개 추가)')
+
+@db_cli.command('seed')
+@click.option('--menus', default=200, show_default=True, help='생성할 메뉴 수')
+@click.option('--orders', default=10000, show_default=True, help='생성할 주문 수')
+@click.option('--days', default=365, show_default=True, help='주문일시를 분포시킬 과거 일수')
+@click.option('--batch-size', default=5000, show_default=True, help='한 번에 INSERT/커밋할 주문 수')
+@click.option('--random-seed', type=int, default=None, help='재현 가능한 데이터 생성을 위한 시드')
+@click.option('--store', default=None, help='데이터를 생성할 매장 ID (기본값: DEFAULT_STORE)')
+def seed_command(menus, orders, days, batch_size, random_seed, store):
+    """성능 테스트용 대량 메뉴/주문 생성"""
+    rng = random.Random(random_seed)
+    use_store(store)
+    store_id = current_store()
+    upgrade_stores()
+
+    # 메뉴 생성
+    combos = [(flavor, base) for flavor in SEED_FLAVORS for base in SEED_BASES]
+    start_order = (db.session.query(func.max(Menu.display_order))
+                   .filter(Menu.store_id == store_id, Menu.display_order < 9999).scalar() or 0) + 1
+    menu_rows = []
+    for i in range(menus):
+        flavor, base = combos[i % len(combos)]
+        category, temperature_option = SEED_BASES[base]
+        suffix = f' {i // len(combos) + 1}' if i >= len(combos) else ''
+        menu_rows.append({
+            'store_id': store_id,
+            'name': f'{flavor} {base}{suffix}',
+            'category': category,
+            'price': rng.randrange(3000, 8000, 500),
+            'description': f'{flavor} 풍미의 {base}',
+            'temperature_option': temperature_option,
+            'display_order': start_order + i,
+        })
+    if menu_rows:
+        db.session.execute(insert(Menu), menu_rows)
+        db.session.commit()
+    click.echo(f'메뉴 {len(menu_rows)}개 생성')
+
+    menu_prices = db.session.execute(select(Menu.id, Menu.price, Menu.temperature_option).where(Menu.store_id == store_id)).all()
+    if not menu_prices:
+        click.echo('메뉴가 없어 주문을 생성하지 않습니다.')
+        return
+
+    # 주문 생성 (id를 미리 할당해 주문항목과 함께 배치 INSERT)
+    next_id = (db.session.query(func.max(Order.id)).scalar() or 0) + 1
+    now = datetime.now()
+    created = 0
+    while created < orders:
+        order_rows, item_rows = [], []
+        for _ in range(min(batch_size, orders - created)):
+            order_date = now - timedelta(seconds=rng.randrange(days * 86400))
+            total = 0
+            for menu_id, price, temperature_option in rng.sample(menu_prices, k=min(len(menu_prices), rng.randint(1, 4))):
+                quantity = rng.randint(1, 3)
+                temperature = rng.choice(['hot', 'ice']) if temperature_option == 'both' else temperature_option
+                item_rows.append({
+                    'order_id': next_id, 'menu_id': menu_id, 'quantity': quantity,
+                    'subtotal': price * quantity, 'temperature': temperature,
+                    'special_request': '', 'created_at': order_date,
+                })
+                total += price * quantity
+            order_rows.append({
+                'id': next_id, 'store_id': store_id, 'order_date': order_date, 'status': rng.choice(SEED_STATUSES),
+                'total_amount': int(total), 'customer_name': rng.choice(SEED_NAMES),
+                'delivery_location': rng.choice(SEED_LOCATIONS), 'delivery_time': '',
+                'order_request': '', 'created_at': order_date, 'updated_at': order_date,
+            })
+            next_id += 1
+        db.session.execute(insert(Order), order_rows)
+        db.session.execute(insert(OrderItem), item_rows)
+        db.session.commit()
+        created += len(order_rows)
+        click.echo(f'  주문 {created}/{orders}')
+
+    rebuild_daily_sales()
+    db.session.commit()
+    click.echo(f'주문 {created}개 생성 완료 (일별 매출 롤업 재계산)')
+
+@events_cli.command('replay')
+@click.option('--store', default=None, help='대상 매장 ID (기본값: DEFAULT_STORE)')
+@click.option('--until', default=None, help='이 시각(ISO 형식)까지의 이벤트만 적용')
+@click.option('--apply-status', is_flag=True, help='로그 기준으로 주문 상태를 맞추고 삭제된 주문을 삭제')
+@click.option('--rollups', is_flag=True, help='로그에 기록된 주문이 있는 날짜의 일별 매출을 주문 테이블에서 다시 계산')
+def replay_command(store, until, apply_status, rollups):
+    """이벤트 로그를 재생해 DB의 주문 상태/일별 매출과 비교 (옵션을 주면 복구)"""
+    if until and (apply_status or rollups):
+        # 특정 시점의 상태로 현재 DB를 덮어쓰면 그 이후의 변경이 사라짐
+        raise click.UsageError('--until은 비교에만 사용할 수 있습니다 (--apply-status/--rollups와 함께 사용 불가).')
+    use_store(store)
+    store_id = current_store()
+    event_log = get_event_log()
+    event_log.close()  # 아직 기록되지 않은 이벤트 반영
+    orders = replay(event_log.read(), store_id=store_id, until=until)
+    click.echo(f'[{store_id}] 이벤트 로그의 주문 {len(orders)}개')
+
+    # 로그와 DB 비교
+    order_ids = [order_id for _, order_id in orders]
+    existing = {}
+    for i in range(0, len(order_ids), 500):  # SQLite 바인드 변수 수 제한
+        existing.update(db.session.execute(
+            select(Order.id, Order.status).where(Order.store_id == store_id, Order.id.in_(order_ids[i:i + 500]))
+        ).all())
+    mismatched, to_delete, missing = [], [], []
+    for (_, order_id), state in sorted(orders.items()):
+        if order_id not in existing:
+            if not state['deleted']:
+                missing.append(order_id)
+        elif state['deleted']:
+            to_delete.append(order_id)
+        elif state['status'] is not None and state['status'] != existing[order_id]:
+            mismatched.append((order_id, existing[order_id], state['status']))
+    for order_id, db_status, log_status in mismatched:
+        click.echo(f'  상태 불일치: 주문 {order_id} DB={db_status} 로그={log_status}')
+    for order_id in to_delete:
+        click.echo(f'  삭제되지 않음: 주문 {order_id}')
+    for order_id in missing:
+        click.echo(f'  DB에 없음: 주문 {order_id} (복구하려면 백업 필요)')
+    click.echo(f'상태 불일치 {len(mismatched)}개, 삭제되지 않은 주문 {len(to_delete)}개, DB에 없는 주문 {len(missing)}개')
+
+    if apply_status:
+        # 관리자 화면과 같은 경로로 변경 (version 증가, 재고/픽업 시간대 반환, 일별 매출, 이벤트 기록)
+        # 웹 워커의 메뉴 캐시는 재고 시그니처가 바뀌었으므로 다음 조회 때 DB 기준으로 맞춰짐
+        changed = 0
+        for order_id, db_status, log_status in mismatched:
+            try:
+                row, _ = change_order_status(db.session.get(Order, order_id), log_status)
+                db.session.commit()
+            except ValueError as e:
+                db.session.rollback()
+                click.echo(f'  주문 {order_id} 상태 수정 실패: {e}')
+                continue
+            record_event(STATUS_CHANGED, order_id,
+                         **{'from': db_status, 'to': log_status, 'version': row.version, 'replay': True})
+            changed += 1
+        for order_id in to_delete:
+            snapshot, _ = remove_order(db.session.get(Order, order_id))
+            db.session.commit()
+            record_event(ORDER_DELETED, order_id, replay=True, **snapshot)
+        event_log.close()
+        click.echo(f'주문 상태 {changed}개 수정, 주문 {len(to_delete)}개 삭제')
+
+    if rollups:
+        # 로그에 기록된 주문의 날짜를 주문 테이블에서 다시 계산 (로그 시작 이전 주문도 포함되도록)
+        days = {datetime.fromisoformat(state['order_date']).date()
+                for state in orders.values() if state['order_date'] is not None}
+        refresh_daily_sales(days, store_id)
+        db.session.commit()
+        click.echo(f'일별 매출 {len(days)}일 재계산')
+
+def register_commands(app):
+    """CLI 명령어 등록"""
+    app.cli.add_command(db_cli)
+    app.cli.add_command(events_cli)
@@ -26,6 +26,65 @@ class Config:
     ADMIN_USERNAME = os.environ.get('ADMIN_USERNAME') or 'admin'
     ADMIN_PASSWORD = os.environ.get('ADMIN_PASSWORD') or 'admin123'
     
+    # 요청 제한 설정 (토큰 버킷: 최대 요청 수, 충전 주기(초), 키 기준 'session'/'ip')
+    RATELIMIT_ENABLED = True
+    RATELIMIT_BACKEND = os.environ.get('RATELIMIT_BACKEND') or 'memory'  # 'memory' (워커별) / 'sqlite' (워커 간 공유)
+    RATELIMIT_SQLITE_PATH = 'ratelimit.db'  # instance 폴더 기준
+    RATE_LIMITS = {
+        'cart': (30, 60, 'session'),
+        'checkout': (5, 60, 'session'),
+        'admin_login': (5, 300, 'ip'),
+    }
+    
+    # 쓰기 요청 admission 제어 (동시 쓰기 수, 대기열 크기, 최대 대기 시간(초))
+    WRITE_CONCURRENCY = 4
+    WRITE_QUEUE_SIZE = 32
+    WRITE_QUEUE_TIMEOUT = 3.0
+    
+    # 매장 설정 ({매장 ID: 매장 이름}) - 메뉴/주문/매출은 매장별로 구분됨
+    STORES = {'main': '본점'}
+    DEFAULT_STORE = 'main'
+    # True이면 매장마다 별도 SQLite 파일(instance 폴더 기준)을 사용
+    STORE_SHARDING = os.environ.get('STORE_SHARDING') == '1'
+    STORE_DB_PATH = 'stores/{store}.db'
+    
+    # 픽업 시간대 설정 (시간대 길이(분), 시간대별 최대 주문 수, 영업시간, 최소 준비 시간(분), 예약 가능 일수)
+    PICKUP_SLOT_MINUTES = 15
+    PICKUP_SLOT_CAPACITY = 10
+    PICKUP_OPEN = '08:00'
+    PICKUP_CLOSE = '20:00'
+    PICKUP_LEAD_MINUTES = 10
+    PICKUP_DAYS_AHEAD = 1  # 0: 당일만, 1: 내일까지
+    
+    # 주문 이벤트 로그 설정 (write-behind: 배치 크기, 기록 주기(초), 대기열 크기)
+    EVENTS_ENABLED = True
+    EVENTS_BACKEND = os.environ.get('EVENTS_BACKEND') or 'sqlite'  # 'sqlite' / 'jsonl'
+    EVENTS_SQLITE_PATH = 'events.db'  # instance 폴더 기준
+    EVENTS_JSONL_DIR = 'events'  # instance 폴더 기준
+    EVENTS_JSONL_MAX_BYTES = 10 * 1024 * 1024
+    EVENTS_BATCH_SIZE = 200
+    EVENTS_FLUSH_INTERVAL = 0.5
+    EVENTS_QUEUE_SIZE = 10000
+
+    # 대용량 주문 내보내기 (이보다 많으면 기간을 나누어 여러 프로세스로 월별 CSV ZIP 생성)
+    EXPORT_PARALLEL_MIN_ORDERS = 20000
+    EXPORT_CHUNK_MONTHS = 1
+    EXPORT_PROCESSES = None  # None: CPU 코어 수 (구간 수 이내)
+
+    # 관리자 쿼리 프로파일러 (/admin/profiler)
+    PROFILER_HISTORY = 30  # 워커별로 보관할 최근 프로파일 수
+    PROFILER_SLOW_MS = 500  # 이보다 느린 요청만 스택 샘플 보관
+    PROFILER_SAMPLE_INTERVAL = 0.005  # 스택 샘플링 주기(초)
+    PROFILER_SCAN_TABLES = ('cafe_order', 'cafe_order_item')  # 전체 스캔을 경고할 테이블
+    
+    # 메뉴 캐시 설정 (다른 워커의 메뉴 변경을 확인하는 주기, 초)
+    MENU_CACHE_TTL = 2
+    
+    # 비동기 모드 (asgi.py) - 매장 DB마다 유지할 aiosqlite 연결 수, 나머지 페이지를 처리할 스레드 수
+    ASYNC_DB_POOL_SIZE = 5
+    ASYNC_DB_MAX_OVERFLOW = 5
+    ASGI_WSGI_THREADS = 10
+    
     # 페이지네이션 설정
     ORDERS_PER_PAGE = 20
     
@@ -0,0 +1,239 @@
+"""주문 이벤트 로그 (write-behind)
+
+주문 생성/상태 변경/삭제 이벤트를 append-only 로그로 남깁니다. 요청 처리 중에는 메모리 큐에 넣기만 하고,
+백그라운드 스레드가 EVENTS_FLUSH_INTERVAL초 또는 EVENTS_BATCH_SIZE건마다 모아서 한 번에 기록하므로
+주문 처리 경로에 감사(audit) INSERT가 추가되지 않습니다.
+
+- EVENTS_BACKEND = 'sqlite': instance/EVENTS_SQLITE_PATH 파일의 cafe_order_event 테이블
+  (주문 DB와 파일을 분리해 주문 쓰기 잠금과 경쟁하지 않음, 여러 워커가 함께 사용 가능)
+- EVENTS_BACKEND = 'jsonl': instance/EVENTS_JSONL_DIR/events.jsonl, EVENTS_JSONL_MAX_BYTES를 넘으면
+  events-<시각>.jsonl로 교체 (워커 1개일 때 사용)
+
+프로세스가 정상 종료되면 atexit에서 남은 이벤트를 모두 기록합니다.
+로그로 주문 상태/일별 매출을 다시 계산하는 명령은 `flask --app app events replay`입니다.
+"""
+import atexit
+import glob
+import json
+import os
+import queue
+import sqlite3
+import threading
+from datetime import datetime
+
+from flask import current_app
+
+from stores import current_store
+
+# 이벤트 종류
+ORDER_CREATED = 'order_created'
+STATUS_CHANGED = 'status_changed'
+ORDER_DELETED = 'order_deleted'
+
+class SQLiteEventStore:
+    """SQLite 파일에 이벤트 기록"""
+
+    def __init__(self, path):
+        self.path = path
+        with self._connect() as conn:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS cafe_order_event ('
+                'id INTEGER PRIMARY KEY AUTOINCREMENT, ts TEXT NOT NULL, store_id TEXT NOT NULL, '
+                'order_id INTEGER NOT NULL, event TEXT NOT NULL, data TEXT NOT NULL)'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS ix_cafe_order_event_order ON cafe_order_event (store_id, order_id)')
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=10.0)
+        conn.execute('PRAGMA journal_mode=WAL')
+        return conn
+
+    def write(self, records):
+        conn = self._connect()
+        try:
+            with conn:
+                conn.executemany(
+                    'INSERT INTO cafe_order_event (ts, store_id, order_id, event, data) VALUES (?, ?, ?, ?, ?)',
+                    [(r['ts'], r['store_id'], r['order_id'], r['event'], json.dumps(r['data'], ensure_ascii=False))
+                     for r in records]
+                )
+        finally:
+            conn.close()
+
+    def read(self):
+        conn = self._connect()
+        try:
+            rows = conn.execute('SELECT ts, store_id, order_id, event, data FROM cafe_order_event ORDER BY id')
+            for ts, store_id, order_id, event, data in rows:
+                yield {'ts': ts, 'store_id': store_id, 'order_id': order_id, 'event': event, 'data': json.loads(data)}
+        finally:
+            conn.close()
+
+class JSONLEventStore:
+    """크기 기준으로 교체되는 JSONL 파일에 이벤트 기록"""
+
+    def __init__(self, directory, max_bytes):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.path = os.path.join(directory, 'events.jsonl')
+        os.makedirs(directory, exist_ok=True)
+
+    def _rotate(self):
+        if os.path.exists(self.path) and os.path.getsize(self.path) >= self.max_bytes:
+            stamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+            os.replace(self.path, os.path.join(self.directory, f'events-{stamp}.jsonl'))
+
+    def write(self, records):
+        self._rotate()
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(''.join(json.dumps(r, ensure_ascii=False) + '\n' for r in records))
+            f.flush()
+            os.fsync(f.fileno())
+
+    def read(self):
+        # 교체된 파일은 이름에 시각이 들어 있으므로 이름순이 기록순
+        paths = sorted(glob.glob(os.path.join(self.directory, 'events-*.jsonl')))
+        if os.path.exists(self.path):
+            paths.append(self.path)
+        for path in paths:
+            with open(path, encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+
+class EventLog:
+    """이벤트 큐 + 백그라운드 기록 스레드"""
+
+    def __init__(self, store, batch_size, flush_interval, queue_size, logger):
+        self.store = store
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.logger = logger
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._lock = threading.Lock()
+        self._thread = None
+        self._registered = False
+
+    def _start(self):
+        # 스레드는 첫 이벤트 때 시작 (CLI, 리로더 부모 프로세스 등에서는 만들지 않음)
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='event-log-writer', daemon=True)
+                self._thread.start()
+                if not self._registered:
+                    atexit.register(self.close)
+                    self._registered = True
+
+    def append(self, record):
+        """이벤트 1건 추가 (큐가 가득 차면 기록될 때까지 대기)"""
+        self._start()
+        self._queue.put(record)
+
+    def _run(self):
+        stop = False
+        while not stop:
+            batch = []
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+                if item is None:
+                    stop = True
+                else:
+                    batch.append(item)
+                while not stop and len(batch) < self.batch_size:
+                    item = self._queue.get_nowait()
+                    if item is None:
+                        stop = True
+                    else:
+                        batch.append(item)
+            except queue.Empty:
+                pass
+            if batch:
+                self._write(batch)
+
+    def _write(self, batch):
+        try:
+            self.store.write(batch)
+        except Exception:
+            # 기록 실패 시 이벤트를 버리지 않고 로그에 원문을 남김
+            self.logger.exception('event log write failed: %s', json.dumps(batch, ensure_ascii=False))
+
+    def close(self):
+        """남은 이벤트를 모두 기록하고 스레드 종료"""
+        thread = self._thread
+        if thread is not None and thread.is_alive():
+            self._queue.put(None)
+            thread.join()
+
+    def read(self):
+        return self.store.read()
+
+def get_event_log():
+    """앱 설정에 맞는 이벤트 로그 (앱마다 1개)"""
+    event_log = current_app.extensions.get('event_log')
+    if event_log is None:
+        config = current_app.config
+        if config['EVENTS_BACKEND'] == 'jsonl':
+            store = JSONLEventStore(os.path.join(current_app.instance_path, config['EVENTS_JSONL_DIR']),
+                                    config['EVENTS_JSONL_MAX_BYTES'])
+        else:
+            os.makedirs(current_app.instance_path, exist_ok=True)
+            store = SQLiteEventStore(os.path.join(current_app.instance_path, config['EVENTS_SQLITE_PATH']))
+        event_log = EventLog(store, config['EVENTS_BATCH_SIZE'], config['EVENTS_FLUSH_INTERVAL'],
+                             config['EVENTS_QUEUE_SIZE'], current_app.logger)
+        event_log = current_app.extensions.setdefault('event_log', event_log)
+    return event_log
+
+def record_event(event, order_id, **data):
+    """주문 이벤트 기록 예약 (커밋 후 호출)"""
+    if not current_app.config['EVENTS_ENABLED']:
+        return
+    get_event_log().append({
+        'ts': datetime.now().isoformat(timespec='microseconds'),
+        'store_id': current_store(),
+        'order_id': order_id,
+        'event': event,
+        'data': data,
+    })
+
+def order_snapshot(order):
+    """재생(replay)에 필요한 주문 정보"""
+    return {
+        'order_date': order.order_date.isoformat(),
+        'status': order.status,
+        'total_amount': order.total_amount,
+        'customer_name': order.customer_name,
+        'pickup_slot': order.pickup_slot.isoformat() if order.pickup_slot else None,
+    }
+
+def replay(records, store_id=None, until=None):
+    """이벤트를 순서대로 적용해 주문 상태 재구성
+
+    반환: {(store_id, order_id): {'status', 'version', 'order_date', 'total_amount', 'deleted'}}
+    생성 이벤트가 없는(로그 시작 이전) 주문은 order_date/total_amount가 None입니다.
+    """
+    orders = {}
+    # 여러 워커가 배치를 따로 기록하므로 기록 순서는 시각 순서와 다를 수 있음 (같은 시각이면 기록 순)
+    for record in sorted(records, key=lambda record: record['ts']):
+        if store_id and record['store_id'] != store_id:
+            continue
+        if until and record['ts'] > until:
+            continue
+        key = (record['store_id'], record['order_id'])
+        state = orders.setdefault(key, {'status': None, 'version': None, 'order_date': None,
+                                        'total_amount': None, 'deleted': False})
+        data = record['data']
+        if record['event'] == ORDER_CREATED:
+            state.update(order_date=data['order_date'], total_amount=data['total_amount'], deleted=False)
+            if state['version'] is None:
+                state.update(status=data['status'], version=1)
+        elif record['event'] == STATUS_CHANGED:
+            # 같은 주문의 상태 변경은 version이 더 높은 쪽이 최신 (워커 간 시계 차이가 있어도)
+            version = data.get('version')
+            if version is None or state['version'] is None or version > state['version']:
+                state['status'] = data['to']
+                state['version'] = version if version is not None else state['version']
+        elif record['event'] == ORDER_DELETED:
+            state['deleted'] = True
+            if state['order_date'] is None:
+                state.update(order_date=data.get('order_date'), total_amount=data.get('total_amount'))
+    return orders
@@ -0,0 +1,100 @@
+"""대용량 주문 내보내기 (멀티프로세스)
+
+몇 년치 주문을 한 번에 내보내면 pandas/xlsxwriter 직렬화가 CPU 코어 하나에서 병목이 되므로,
+기간을 EXPORT_CHUNK_MONTHS개월 단위로 나누어 프로세스 풀에서 구간마다 CSV 파일 하나씩 만들고
+(주문/주문항목/메뉴 JOIN 조회 한 번 + csv 모듈), 완성된 파일을 월별 CSV가 들어 있는 ZIP 하나로 묶습니다.
+
+자식 프로세스는 Flask 앱 없이 DB 파일에 직접 연결하므로 SQLite DB에서만 사용할 수 있습니다.
+요청 스레드(이벤트 로그 등)가 있는 프로세스를 fork하지 않도록 spawn 방식으로 프로세스를 만듭니다.
+"""
+import csv
+import multiprocessing
+import os
+import tempfile
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, func, select
+
+from models import Order, OrderItem, Menu
+
+EXPORT_COLUMNS = ['매장', '주문번호', '주문일시', '고객명', '배달위치', '배달시간', '픽업시간대', '메뉴명',
+                  '수량', '온도', '특별요청', '소계', '총액', '상태', '주문요청사항']
+
+def month_chunks(start, end, months=1):
+    """[start, end) 범위를 months개월 단위 [(구간 시작, 구간 끝)]으로 분할 (첫 구간은 start가 속한 달의 1일부터)"""
+    chunks = []
+    chunk_start = datetime(start.year, start.month, 1)
+    while chunk_start < end:
+        month_index = chunk_start.year * 12 + chunk_start.month - 1 + months
+        chunk_end = datetime(month_index // 12, month_index % 12 + 1, 1)
+        chunks.append((max(chunk_start, start), min(chunk_end, end)))
+        chunk_start = chunk_end
+    return chunks
+
+def _chunk_stmt(store_id, start, end):
+    return (
+        select(Order.id, Order.order_date, Order.customer_name, Order.delivery_location, Order.delivery_time,
+               Order.pickup_slot, Menu.name, OrderItem.quantity, OrderItem.temperature, OrderItem.special_request,
+               OrderItem.subtotal, Order.total_amount, Order.status, Order.order_request)
+        .join(OrderItem, OrderItem.order_id == Order.id)
+        .outerjoin(Menu, Menu.id == OrderItem.menu_id)
+        .where(Order.store_id == store_id, Order.order_date >= start, Order.order_date < end)
+        .order_by(Order.order_date, Order.id, OrderItem.id)
+    )
+
+def export_chunk(db_url, store_id, store_name, start, end, path):
+    """한 구간의 주문을 CSV로 저장 (자식 프로세스에서 실행) -> 저장한 행 수"""
+    engine = create_engine(db_url)
+    rows = 0
+    try:
+        with engine.connect() as conn, open(path, 'w', newline='', encoding='utf-8-sig') as f:
+            writer = csv.writer(f)
+            writer.writerow(EXPORT_COLUMNS)
+            result = conn.execution_options(stream_results=True).execute(_chunk_stmt(store_id, start, end))
+            for (order_id, order_date, customer_name, delivery_location, delivery_time, pickup_slot, menu_name,
+                 quantity, temperature, special_request, subtotal, total_amount, status, order_request) in result:
+                writer.writerow([
+                    store_name, order_id, order_date.strftime('%Y-%m-%d %H:%M:%S'), customer_name,
+                    delivery_location, delivery_time or '',
+                    pickup_slot.strftime('%Y-%m-%d %H:%M') if pickup_slot else '',
+                    menu_name or '삭제된 메뉴', quantity, temperature, special_request or '', subtotal,
+                    total_amount, status, order_request or '',
+                ])
+                rows += 1
+    finally:
+        engine.dispose()
+    return rows
+
+def order_date_bounds(session, store_id, start=None, end=None):
+    """내보낼 범위 [시작, 끝) - 지정하지 않은 쪽은 실제 첫/마지막 주문일시 (주문이 없으면 None)"""
+    first, last = session.execute(
+        select(func.min(Order.order_date), func.max(Order.order_date)).where(Order.store_id == store_id)
+    ).one()
+    if first is None:
+        return None
+    after_last = last + timedelta(seconds=1)
+    return (max(start, first) if start else first), (min(end, after_last) if end else after_last)
+
+def parallel_export(db_url, store_id, store_name, start, end, output, months=1, processes=None):
+    """[start, end) 주문을 구간별로 병렬 직렬화해 월별 CSV ZIP을 output(파일 객체)에 기록 -> 전체 행 수"""
+    chunks = month_chunks(start, end, months)
+    total = 0
+    with tempfile.TemporaryDirectory(prefix='cafe-export-') as tmpdir:
+        with ProcessPoolExecutor(max_workers=processes or max(1, min(len(chunks), os.cpu_count() or 1)),
+                                 mp_context=multiprocessing.get_context('spawn')) as pool:
+            futures = []
+            for chunk_start, chunk_end in chunks:
+                path = os.path.join(tmpdir, f'{chunk_start:%Y-%m}.csv')
+                futures.append((path, pool.submit(export_chunk, db_url, store_id, store_name,
+                                                  chunk_start, chunk_end, path)))
+            # 오래된 구간부터 ZIP에 추가 (주문이 없는 달은 제외)
+            with zipfile.ZipFile(output, 'w', compression=zipfile.ZIP_DEFLATED, compresslevel=1) as archive:
+                for path, future in futures:
+                    rows = future.result()
+                    if rows:
+                        archive.write(path, f'주문내역_{os.path.basename(path)}')
+                        total += rows
+                    os.remove(path)
+    return total
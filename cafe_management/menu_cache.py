@@ -0,0 +1,223 @@
+"""메뉴 스냅샷 캐시와 검색 인덱스
+
+메뉴는 주문보다 훨씬 적게 바뀌므로 워커마다 매장별 메뉴 전체를 메모리에 올려 두고,
+이름/설명에 대한 n-gram 역색인으로 검색합니다 (한글 부분 일치, 초성 검색 지원).
+
+다른 워커에서 메뉴가 수정된 경우를 위해 MENU_CACHE_TTL초마다
+(개수, 최대 id, 최종 수정 시각, version 합계, 재고 합계) 시그니처만 조회해 바뀌었을 때만 다시 읽습니다.
+주문으로 재고만 바뀐 경우에는 재고/품절 상태만 조회해 기존 검색 인덱스를 그대로 재사용하고,
+같은 워커의 주문은 update_availability()로 조회 없이 바로 반영합니다.
+같은 워커에서 메뉴를 수정하면 invalidate()로 즉시 무효화합니다.
+"""
+import copy
+import threading
+import time
+from collections import namedtuple
+
+from flask import current_app
+from sqlalchemy import func, select
+
+from models import Menu
+from stores import current_store
+
+MenuEntry = namedtuple('MenuEntry', [
+    'id', 'name', 'category', 'price', 'description', 'image',
+    'temperature_option', 'display_order', 'is_soldout', 'stock', 'version',
+])
+
+# 시그니처 중 메뉴 구성(검색 인덱스)에 해당하는 앞부분 길이 - 나머지는 재고
+CATALOG_SIGNATURE_LENGTH = 4
+
+# 한글 초성 (유니코드 '가'부터 19개 초성 x 588)
+CHOSUNG = 'ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ'
+
+# 온도 필터 -> 허용되는 temperature_option 값
+TEMPERATURE_FILTERS = {
+    'hot': ('hot', 'both'),
+    'ice': ('ice', 'both'),
+    'none': ('none',),
+}
+
+def normalize(text):
+    """검색용 정규화: 소문자, 공백 제거"""
+    return ''.join((text or '').lower().split())
+
+def to_chosung(text):
+    """한글 음절을 초성으로 변환 (그 외 문자는 그대로)"""
+    result = []
+    for ch in text:
+        code = ord(ch) - 0xAC00
+        result.append(CHOSUNG[code // 588] if 0 <= code < 11172 else ch)
+    return ''.join(result)
+
+def is_chosung_query(query):
+    return bool(query) and all(ch in CHOSUNG for ch in query)
+
+def ngrams(text):
+    """1-gram + 2-gram 집합"""
+    grams = set(text)
+    grams.update(text[i:i + 2] for i in range(len(text) - 1))
+    return grams
+
+def _signature_stmt(store_id):
+    return (select(func.count(Menu.id), func.max(Menu.id), func.max(Menu.updated_at),
+                   func.coalesce(func.sum(Menu.version), 0),
+                   func.coalesce(func.sum(Menu.stock), 0), func.count(Menu.stock))
+            .where(Menu.store_id == store_id))
+
+def _availability_stmt(store_id):
+    return (select(Menu.id, Menu.stock, Menu.is_soldout)
+            .where(Menu.store_id == store_id, Menu.stock.isnot(None)))
+
+def _entries_stmt(store_id):
+    return (select(*[getattr(Menu, field) for field in MenuEntry._fields])
+            .where(Menu.store_id == store_id)
+            .order_by(Menu.display_order, Menu.id))
+
+class MenuSnapshot:
+    """특정 시점의 메뉴 목록 + 검색 인덱스 (읽기 전용)"""
+
+    def __init__(self, entries, signature):
+        self.entries = entries
+        self.signature = signature
+        self.by_id = {entry.id: entry for entry in entries}
+        self.categories = list(dict.fromkeys(entry.category for entry in entries))
+        self.position = {entry.id: i for i, entry in enumerate(entries)}
+
+        # 정규화된 검색 텍스트와 n-gram 역색인
+        self._text = {}
+        self._chosung = {}
+        self._index = {}
+        for entry in entries:
+            text = normalize(entry.name) + '\n' + normalize(entry.description)
+            self._text[entry.id] = text
+            self._chosung[entry.id] = to_chosung(normalize(entry.name))
+            for gram in ngrams(text):
+                self._index.setdefault(gram, set()).add(entry.id)
+
+    def _match_ids(self, query):
+        """검색어와 일치하는 메뉴 id 집합"""
+        if is_chosung_query(query):
+            return {menu_id for menu_id, chosung in self._chosung.items() if query in chosung}
+
+        grams = ngrams(query) if len(query) < 2 else {query[i:i + 2] for i in range(len(query) - 1)}
+        candidates = None
+        for gram in sorted(grams, key=lambda g: len(self._index.get(g, ()))):
+            ids = self._index.get(gram)
+            if not ids:
+                return set()
+            candidates = set(ids) if candidates is None else candidates & ids
+            if not candidates:
+                return set()
+        # n-gram 교집합은 후보일 뿐이므로 실제 부분 문자열 포함 여부 확인
+        return {menu_id for menu_id in candidates if query in self._text[menu_id]}
+
+    def search(self, query='', category='', temperature='', min_price=None, max_price=None, available_only=False):
+        """검색/필터 결과를 표시 순서대로 반환"""
+        query = normalize(query)
+        if query:
+            ids = self._match_ids(query)
+            entries = sorted((self.by_id[i] for i in ids), key=lambda e: self.position[e.id])
+        else:
+            entries = self.entries
+
+        allowed_temperatures = TEMPERATURE_FILTERS.get(temperature)
+        return [
+            entry for entry in entries
+            if (not category or entry.category == category)
+            and (allowed_temperatures is None or entry.temperature_option in allowed_temperatures)
+            and (min_price is None or entry.price >= min_price)
+            and (max_price is None or entry.price <= max_price)
+            and (not available_only or not entry.is_soldout)
+        ]
+
+    def with_availability(self, availability, signature):
+        """재고/품절 상태만 바꾼 스냅샷 (검색 인덱스는 공유)
+
+        availability: {메뉴 id: (stock, is_soldout)}
+        """
+        snapshot = copy.copy(self)
+        snapshot.entries = [
+            entry._replace(stock=availability[entry.id][0], is_soldout=availability[entry.id][1])
+            if entry.id in availability else entry
+            for entry in self.entries
+        ]
+        snapshot.by_id = {entry.id: entry for entry in snapshot.entries}
+        snapshot.signature = signature
+        return snapshot
+
+class MenuCache:
+    """워커별/매장별 메뉴 스냅샷 캐시"""
+
+    def __init__(self, ttl, store_id):
+        self.ttl = ttl
+        self.store_id = store_id
+        self._snapshot = None
+        self._checked_at = 0.0
+        self._generation = 0  # invalidate()마다 증가 - 무효화 이전에 시작된 재조회 결과는 저장하지 않음
+        self._lock = threading.Lock()
+
+    def invalidate(self):
+        """다음 조회 때 다시 읽도록 무효화"""
+        with self._lock:
+            self._snapshot = None
+            self._generation += 1
+
+    def _fresh(self, snapshot):
+        return snapshot is not None and time.monotonic() - self._checked_at < self.ttl
+
+    def _store(self, snapshot, generation):
+        with self._lock:
+            if generation == self._generation:
+                self._snapshot = snapshot
+                self._checked_at = time.monotonic()
+        return snapshot
+
+    def update_availability(self, availability):
+        """이 워커에서 처리한 주문의 재고/품절 상태를 조회 없이 반영"""
+        with self._lock:
+            if self._snapshot is not None:
+                # 시그니처는 그대로 두어 다음 확인 때 DB 기준으로 다시 맞춤
+                self._snapshot = self._snapshot.with_availability(availability, self._snapshot.signature)
+
+    @staticmethod
+    def _catalog_changed(snapshot, signature):
+        return (snapshot is None
+                or snapshot.signature[:CATALOG_SIGNATURE_LENGTH] != signature[:CATALOG_SIGNATURE_LENGTH])
+
+    def get(self, session):
+        """스냅샷 조회 (session: 이 매장 DB에 연결된 db.session)"""
+        snapshot, generation = self._snapshot, self._generation
+        if self._fresh(snapshot):
+            return snapshot
+        signature = tuple(session.execute(_signature_stmt(self.store_id)).one())
+        if self._catalog_changed(snapshot, signature):
+            entries = [MenuEntry(*row) for row in session.execute(_entries_stmt(self.store_id))]
+            snapshot = MenuSnapshot(entries, signature)
+        elif snapshot.signature != signature:
+            rows = session.execute(_availability_stmt(self.store_id))
+            snapshot = snapshot.with_availability({row.id: (row.stock, row.is_soldout) for row in rows}, signature)
+        return self._store(snapshot, generation)
+
+    async def aget(self, session):
+        """스냅샷 조회 - 비동기 모드(asgi.py)용 (session: 이 매장 DB의 AsyncSession)"""
+        snapshot, generation = self._snapshot, self._generation
+        if self._fresh(snapshot):
+            return snapshot
+        signature = tuple((await session.execute(_signature_stmt(self.store_id))).one())
+        if self._catalog_changed(snapshot, signature):
+            entries = [MenuEntry(*row) for row in await session.execute(_entries_stmt(self.store_id))]
+            snapshot = MenuSnapshot(entries, signature)
+        elif snapshot.signature != signature:
+            rows = await session.execute(_availability_stmt(self.store_id))
+            snapshot = snapshot.with_availability({row.id: (row.stock, row.is_soldout) for row in rows}, signature)
+        return self._store(snapshot, generation)
+
+def get_menu_cache(store_id=None):
+    """매장별 메뉴 캐시 (기본값: 현재 매장)"""
+    store_id = store_id or current_store()
+    caches = current_app.extensions.setdefault('menu_cache', {})
+    cache = caches.get(store_id)
+    if cache is None:
+        cache = caches.setdefault(store_id, MenuCache(current_app.config['MENU_CACHE_TTL'], store_id))
+    return cache
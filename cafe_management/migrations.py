@@ -0,0 +1,176 @@
+"""버전 기반 스키마 마이그레이션
+
+운영 중인 cafe.db에 인덱스/컬럼/롤업 테이블을 추가하기 위한 최소한의 마이그레이션 엔진입니다.
+적용된 버전은 cafe_schema_version 테이블에 기록되며 `flask --app app db upgrade`로 실행합니다.
+
+SQLite에서 ADD COLUMN, CREATE INDEX는 테이블을 재작성하지 않으므로 서비스 중에도 적용할 수 있습니다.
+마이그레이션마다 별도 트랜잭션으로 실행해 쓰기 잠금을 짧게 유지하고,
+중간에 실패해도 다시 실행할 수 있도록 각 단계는 멱등하게 작성합니다.
+"""
+from datetime import datetime
+from sqlalchemy import inspect, text
+
+MIGRATIONS = []
+
+VERSION_TABLE = 'cafe_schema_version'
+
+# 매장 구분 이전 데이터의 기본 매장 (config.DEFAULT_STORE)
+DEFAULT_STORE = 'main'
+
+def migration(version, description):
+    """마이그레이션 등록 데코레이터"""
+    def decorator(f):
+        MIGRATIONS.append((version, description, f))
+        MIGRATIONS.sort(key=lambda m: m[0])
+        return f
+    return decorator
+
+# ====================== 헬퍼 ======================
+
+def has_column(conn, table, column):
+    """컬럼 존재 여부"""
+    return column in {c['name'] for c in inspect(conn).get_columns(table)}
+
+def add_column(conn, table, column, ddl):
+    """컬럼 추가 (이미 있으면 건너뜀)"""
+    if not has_column(conn, table, column):
+        conn.exec_driver_sql(f'ALTER TABLE {table} ADD COLUMN {column} {ddl}')
+
+def create_index(conn, name, table, columns, unique=False):
+    """인덱스 생성 (이미 있으면 건너뜀)"""
+    unique_sql = 'UNIQUE ' if unique else ''
+    conn.exec_driver_sql(f'CREATE {unique_sql}INDEX IF NOT EXISTS {name} ON {table} ({", ".join(columns)})')
+
+def current_version(conn):
+    """현재 적용된 스키마 버전 (없으면 0)"""
+    conn.exec_driver_sql(
+        f'CREATE TABLE IF NOT EXISTS {VERSION_TABLE} ('
+        'version INTEGER PRIMARY KEY, description TEXT, applied_at TEXT)'
+    )
+    return conn.execute(text(f'SELECT COALESCE(MAX(version), 0) FROM {VERSION_TABLE}')).scalar()
+
+def pending_migrations(engine):
+    """아직 적용되지 않은 마이그레이션 목록"""
+    with engine.begin() as conn:
+        version = current_version(conn)
+    return [m for m in MIGRATIONS if m[0] > version]
+
+def upgrade(engine, target=None, store_id=DEFAULT_STORE):
+    """대기 중인 마이그레이션을 순서대로 적용하고 적용된 (버전, 설명) 목록 반환
+    
+    store_id: 매장 구분 이전에 만들어진 기존 행에 채울 매장 ID (매장별 DB라면 해당 매장)
+    """
+    applied = []
+    for version, description, func in pending_migrations(engine):
+        if target is not None and version > target:
+            break
+        with engine.begin() as conn:
+            conn.info['store_id'] = store_id
+            func(conn)
+            conn.execute(
+                text(f'INSERT INTO {VERSION_TABLE} (version, description, applied_at) VALUES (:v, :d, :t)'),
+                {'v': version, 'd': description, 't': datetime.now().isoformat(sep=' ', timespec='seconds')}
+            )
+        applied.append((version, description))
+    return applied
+
+# ====================== 마이그레이션 ======================
+
+# 마이그레이션은 적용 당시의 스키마를 고정된 DDL로 만듭니다 (모델이 바뀌어도 결과가 달라지지 않도록).
+# 이후에 추가된 컬럼/테이블은 해당 버전의 마이그레이션에서 추가합니다.
+
+@migration(1, '기본 테이블 생성')
+def create_base_tables(conn):
+    # 기존 운영 DB는 테이블이 이미 있으므로 없는 경우에만 생성
+    conn.exec_driver_sql(
+        'CREATE TABLE IF NOT EXISTS cafe_menu ('
+        'id INTEGER NOT NULL, name VARCHAR(100) NOT NULL, category VARCHAR(50) NOT NULL, '
+        'price FLOAT NOT NULL, description TEXT, image VARCHAR(255), temperature_option VARCHAR(20), '
+        'display_order INTEGER, is_soldout BOOLEAN, created_at DATETIME, updated_at DATETIME, '
+        'PRIMARY KEY (id))'
+    )
+    conn.exec_driver_sql(
+        'CREATE TABLE IF NOT EXISTS cafe_order ('
+        'id INTEGER NOT NULL, order_date DATETIME NOT NULL, status VARCHAR(20) NOT NULL, '
+        'total_amount INTEGER NOT NULL, customer_name VARCHAR(50) NOT NULL, '
+        'delivery_location VARCHAR(100) NOT NULL, delivery_time VARCHAR(50), order_request TEXT, '
+        'created_at DATETIME, updated_at DATETIME, '
+        'PRIMARY KEY (id))'
+    )
+    conn.exec_driver_sql(
+        'CREATE TABLE IF NOT EXISTS cafe_order_item ('
+        'id INTEGER NOT NULL, order_id INTEGER NOT NULL, menu_id INTEGER NOT NULL, '
+        'quantity INTEGER NOT NULL, subtotal FLOAT NOT NULL, special_request TEXT, '
+        'temperature VARCHAR(10), created_at DATETIME, '
+        'PRIMARY KEY (id), '
+        'FOREIGN KEY(order_id) REFERENCES cafe_order (id), '
+        'FOREIGN KEY(menu_id) REFERENCES cafe_menu (id))'
+    )
+
+@migration(2, '주문/메뉴 조회 인덱스 추가')
+def add_lookup_indexes(conn):
+    create_index(conn, 'ix_cafe_order_order_date', 'cafe_order', ['order_date'])
+    create_index(conn, 'ix_cafe_order_item_order_id', 'cafe_order_item', ['order_id'])
+    create_index(conn, 'ix_cafe_order_item_menu_id', 'cafe_order_item', ['menu_id'])
+    create_index(conn, 'ix_cafe_menu_category_display_order', 'cafe_menu', ['category', 'display_order'])
+
+@migration(3, '일별 매출 롤업 테이블 추가')
+def add_daily_sales_rollup(conn):
+    # 이 버전 당시(매장 구분 이전)의 구조로 생성 - 현재 모델 구조로는 5번에서 다시 만들고 채움
+    conn.exec_driver_sql(
+        'CREATE TABLE IF NOT EXISTS cafe_daily_sales ('
+        'sales_date DATE NOT NULL, order_count INTEGER NOT NULL, total_amount INTEGER NOT NULL, '
+        'updated_at DATETIME, PRIMARY KEY (sales_date))'
+    )
+    # 기존 주문으로 롤업 채우기
+    conn.exec_driver_sql(
+        'INSERT OR REPLACE INTO cafe_daily_sales (sales_date, order_count, total_amount, updated_at) '
+        "SELECT date(order_date), COUNT(id), COALESCE(SUM(total_amount), 0), datetime('now', 'localtime') "
+        'FROM cafe_order GROUP BY date(order_date)'
+    )
+
+@migration(4, '메뉴/주문 version 컬럼 추가 (낙관적 동시성 제어)')
+def add_version_columns(conn):
+    add_column(conn, 'cafe_menu', 'version', 'INTEGER NOT NULL DEFAULT 1')
+    add_column(conn, 'cafe_order', 'version', 'INTEGER NOT NULL DEFAULT 1')
+
+@migration(5, '매장(store_id) 구분 추가, 매장별 인덱스/일별 매출 롤업')
+def add_store_columns(conn):
+    store_id = conn.info.get('store_id', DEFAULT_STORE)
+    for table in ('cafe_menu', 'cafe_order'):
+        if not has_column(conn, table, 'store_id'):
+            add_column(conn, table, 'store_id', f"VARCHAR(30) NOT NULL DEFAULT '{DEFAULT_STORE}'")
+            if store_id != DEFAULT_STORE:
+                conn.execute(text(f'UPDATE {table} SET store_id = :store_id'), {'store_id': store_id})
+
+    # 모든 조회가 매장 조건을 포함하므로 매장 ID를 앞에 둔 복합 인덱스로 교체
+    conn.exec_driver_sql('DROP INDEX IF EXISTS ix_cafe_menu_category_display_order')
+    create_index(conn, 'ix_cafe_menu_store_category_display_order', 'cafe_menu', ['store_id', 'category', 'display_order'])
+    create_index(conn, 'ix_cafe_order_store_order_date', 'cafe_order', ['store_id', 'order_date'])
+
+    # 롤업은 주문에서 다시 계산할 수 있으므로 (매장, 날짜) 기본키로 다시 만들고 채움
+    conn.exec_driver_sql('DROP TABLE IF EXISTS cafe_daily_sales')
+    conn.exec_driver_sql(
+        'CREATE TABLE cafe_daily_sales ('
+        'store_id VARCHAR(30) NOT NULL, sales_date DATE NOT NULL, order_count INTEGER NOT NULL, '
+        'total_amount INTEGER NOT NULL, updated_at DATETIME, PRIMARY KEY (store_id, sales_date))'
+    )
+    conn.exec_driver_sql(
+        'INSERT INTO cafe_daily_sales (store_id, sales_date, order_count, total_amount, updated_at) '
+        "SELECT store_id, date(order_date), COUNT(id), COALESCE(SUM(total_amount), 0), datetime('now', 'localtime') "
+        'FROM cafe_order GROUP BY store_id, date(order_date)'
+    )
+
+@migration(6, '메뉴 재고(stock) 컬럼 추가')
+def add_menu_stock(conn):
+    add_column(conn, 'cafe_menu', 'stock', 'INTEGER')
+
+@migration(7, '픽업 시간대 예약 테이블, 주문 pickup_slot 컬럼 추가')
+def add_pickup_slots(conn):
+    conn.exec_driver_sql(
+        'CREATE TABLE IF NOT EXISTS cafe_pickup_slot ('
+        'store_id VARCHAR(30) NOT NULL, slot_start DATETIME NOT NULL, booked_count INTEGER NOT NULL, '
+        'capacity INTEGER NOT NULL, PRIMARY KEY (store_id, slot_start))'
+    )
+    add_column(conn, 'cafe_order', 'pickup_slot', 'DATETIME')
+    create_index(conn, 'ix_cafe_order_store_pickup_slot', 'cafe_order', ['store_id', 'pickup_slot'])
@@ -1,13 +1,28 @@
+from flask import current_app
 from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.session import Session
 from datetime import datetime
 
-db = SQLAlchemy()
+class StoreSession(Session):
+    """매장별 DB 분리(STORE_SHARDING) 시 현재 매장의 DB로 연결하는 세션"""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and current_app.config.get('STORE_SHARDING'):
+            from stores import store_engine  # stores가 models를 임포트하므로 지연 임포트
+            return store_engine()
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+db = SQLAlchemy(session_options={'class_': StoreSession})
 
 class Menu(db.Model):
     """메뉴 테이블"""
     __tablename__ = 'cafe_menu'
+    __table_args__ = (
+        db.Index('ix_cafe_menu_store_category_display_order', 'store_id', 'category', 'display_order'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
+    store_id = db.Column(db.String(30), nullable=False)  # 매장 ID (config.STORES)
     name = db.Column(db.String(100), nullable=False)
     category = db.Column(db.String(50), nullable=False)
     price = db.Column(db.Float, nullable=False)
@@ -16,6 +31,8 @@ class Menu(db.Model):
     temperature_option = db.Column(db.String(20), default='both')  # 'hot', 'ice', 'both'
     display_order = db.Column(db.Integer, default=9999)
     is_soldout = db.Column(db.Boolean, default=False)
+    stock = db.Column(db.Integer, nullable=True)  # 남은 재고 (None: 재고 관리 안 함, 0이 되면 자동 품절)
+    version = db.Column(db.Integer, nullable=False, default=1)  # 낙관적 동시성 제어용
     created_at = db.Column(db.DateTime, default=datetime.now)
     updated_at = db.Column(db.DateTime, default=datetime.now, onupdate=datetime.now)
     
@@ -28,6 +45,7 @@ class Menu(db.Model):
     def to_dict(self):
         return {
             'id': self.id,
+            'store_id': self.store_id,
             'name': self.name,
             'category': self.category,
             'price': self.price,
@@ -35,21 +53,30 @@ class Menu(db.Model):
             'image': self.image,
             'temperature_option': self.temperature_option,
             'display_order': self.display_order,
-            'is_soldout': self.is_soldout
+            'is_soldout': self.is_soldout,
+            'stock': self.stock,
+            'version': self.version
         }
 
 class Order(db.Model):
     """주문 테이블"""
     __tablename__ = 'cafe_order'
+    __table_args__ = (
+        db.Index('ix_cafe_order_store_order_date', 'store_id', 'order_date'),
+        db.Index('ix_cafe_order_store_pickup_slot', 'store_id', 'pickup_slot'),
+    )
     
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
-    order_date = db.Column(db.DateTime, nullable=False, default=datetime.now)
+    store_id = db.Column(db.String(30), nullable=False)  # 매장 ID (config.STORES)
+    order_date = db.Column(db.DateTime, nullable=False, default=datetime.now, index=True)
     status = db.Column(db.String(20), nullable=False, default='pending')  # pending, preparing, completed, cancelled
     total_amount = db.Column(db.Integer, nullable=False)
     customer_name = db.Column(db.String(50), nullable=False)
     delivery_location = db.Column(db.String(100), nullable=False)
     delivery_time = db.Column(db.String(50), nullable=True)
+    pickup_slot = db.Column(db.DateTime, nullable=True)  # 예약한 픽업 시간대 시작 시각 (없으면 즉시 준비)
     order_request = db.Column(db.Text, nullable=True)
+    version = db.Column(db.Integer, nullable=False, default=1)  # 낙관적 동시성 제어용
     created_at = db.Column(db.DateTime, default=datetime.now)
     updated_at = db.Column(db.DateTime, default=datetime.now, onupdate=datetime.now)
     
@@ -62,13 +89,16 @@ class Order(db.Model):
     def to_dict(self):
         return {
             'id': self.id,
+            'store_id': self.store_id,
             'order_date': self.order_date.isoformat() if self.order_date else None,
             'status': self.status,
             'total_amount': self.total_amount,
             'customer_name': self.customer_name,
             'delivery_location': self.delivery_location,
             'delivery_time': self.delivery_time,
+            'pickup_slot': self.pickup_slot.isoformat() if self.pickup_slot else None,
             'order_request': self.order_request,
+            'version': self.version,
             'order_items': [item.to_dict() for item in self.order_items]
         }
 
@@ -77,8 +107,8 @@ class OrderItem(db.Model):
     __tablename__ = 'cafe_order_item'
     
     id = db.Column(db.Integer, primary_key=True)
-    order_id = db.Column(db.Integer, db.ForeignKey('cafe_order.id'), nullable=False)
-    menu_id = db.Column(db.Integer, db.ForeignKey('cafe_menu.id'), nullable=False)
+    order_id = db.Column(db.Integer, db.ForeignKey('cafe_order.id'), nullable=False, index=True)
+    menu_id = db.Column(db.Integer, db.ForeignKey('cafe_menu.id'), nullable=False, index=True)
     quantity = db.Column(db.Integer, nullable=False)
     subtotal = db.Column(db.Float, nullable=False)
     special_request = db.Column(db.Text)
@@ -98,4 +128,45 @@ class OrderItem(db.Model):
             'subtotal': self.subtotal,
             'special_request': self.special_request,
             'temperature': self.temperature
-        } 
\ No newline at end of file
+        }
+
+class DailySales(db.Model):
+    """매장별 일별 매출 집계 테이블 (주문 테이블에서 재계산되는 롤업)"""
+    __tablename__ = 'cafe_daily_sales'
+    
+    store_id = db.Column(db.String(30), primary_key=True)
+    sales_date = db.Column(db.Date, primary_key=True)
+    order_count = db.Column(db.Integer, nullable=False, default=0)
+    total_amount = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.now, onupdate=datetime.now)
+    
+    def __repr__(self):
+        return f'<DailySales {self.store_id} {self.sales_date} - {self.total_amount}>'
+    
+    def to_dict(self):
+        return {
+            'store_id': self.store_id,
+            'sales_date': self.sales_date.isoformat() if self.sales_date else None,
+            'order_count': self.order_count,
+            'total_amount': self.total_amount
+        }
+
+class PickupSlot(db.Model):
+    """매장별 픽업 시간대 예약 현황 (시간대마다 1행, 예약이 생길 때 생성)"""
+    __tablename__ = 'cafe_pickup_slot'
+    
+    store_id = db.Column(db.String(30), primary_key=True)
+    slot_start = db.Column(db.DateTime, primary_key=True)
+    booked_count = db.Column(db.Integer, nullable=False, default=0)
+    capacity = db.Column(db.Integer, nullable=False)
+    
+    def __repr__(self):
+        return f'<PickupSlot {self.store_id} {self.slot_start} {self.booked_count}/{self.capacity}>'
+    
+    def to_dict(self):
+        return {
+            'store_id': self.store_id,
+            'slot_start': self.slot_start.isoformat() if self.slot_start else None,
+            'booked_count': self.booked_count,
+            'capacity': self.capacity
+        }
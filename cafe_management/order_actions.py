@@ -0,0 +1,85 @@
+"""주문 상태 변경/삭제와 그에 따른 재고, 픽업 시간대, 일별 매출 처리
+
+관리자 화면(routes/orders.py)과 이벤트 로그 복구 명령(flask --app app events replay)이
+같은 경로로 주문을 바꾸도록 부수 효과를 한곳에 모았습니다. 커밋과 이벤트 기록은 호출자가 담당합니다.
+"""
+from collections import Counter
+
+from sqlalchemy import func, select
+
+from models import db, Order, OrderItem
+from events import order_snapshot
+from pickup import book_slot, release_slot
+from rollups import refresh_daily_sales
+from utils import release_stock, reserve_stock, versioned_update
+
+ORDER_STATUSES = ('pending', 'preparing', 'completed', 'cancelled')
+
+def item_quantities(order_ids):
+    """주문들의 메뉴별 주문 수량 합계 Counter {menu_id: 수량}"""
+    order_ids = list(order_ids)
+    quantities = Counter()
+    for i in range(0, len(order_ids), 500):  # SQLite 바인드 변수 수 제한
+        quantities.update(dict(db.session.execute(
+            select(OrderItem.menu_id, func.sum(OrderItem.quantity))
+            .where(OrderItem.order_id.in_(order_ids[i:i + 500]))
+            .group_by(OrderItem.menu_id)
+        ).all()))
+    return quantities
+
+def release_items(quantities):
+    """메뉴별 수량만큼 재고 반환 -> 메뉴 캐시에 반영할 {menu_id: (stock, is_soldout)}"""
+    availability = {}
+    for menu_id, quantity in quantities.items():
+        row = release_stock(menu_id, quantity)
+        if row is not None:
+            availability[row.id] = (row.stock, row.is_soldout)
+    return availability
+
+def change_order_status(order, new_status, version=None):
+    """주문 상태 변경 -> (새 version을 담은 Row, 메뉴 캐시에 반영할 재고)
+
+    version이 주어지면 그 버전일 때만 바꾸며, 다른 요청이 먼저 바꿨으면 (None, {}).
+    취소하면 재고와 픽업 시간대 수용량을 돌려주고, 취소를 되돌리면 다시 차감/예약합니다.
+    재고가 부족해 취소를 되돌릴 수 없으면 ValueError.
+    """
+    old_status, pickup_slot = order.status, order.pickup_slot
+    row = versioned_update(Order, order.id, version, status=new_status)
+    if row is None:
+        return None, {}
+
+    availability = {}
+    if (old_status == 'cancelled') != (new_status == 'cancelled'):
+        quantities = item_quantities([order.id])
+        if new_status == 'cancelled':
+            availability = release_items(quantities)
+        else:
+            for menu_id, quantity in quantities.items():
+                reserved = reserve_stock(menu_id, quantity)
+                if reserved is None:
+                    raise ValueError('품절되었거나 재고가 부족한 메뉴가 있어 취소를 되돌릴 수 없습니다.')
+                if reserved.stock is not None:
+                    availability[reserved.id] = (reserved.stock, reserved.is_soldout)
+        if pickup_slot:
+            if new_status == 'cancelled':
+                release_slot(pickup_slot)
+            else:
+                book_slot(pickup_slot, force=True)
+    return row, availability
+
+def remove_order(order):
+    """주문 삭제 후 그날 일별 매출 재계산 -> (ORDER_DELETED 이벤트용 스냅샷, 메뉴 캐시에 반영할 재고)
+
+    취소된 주문은 취소할 때 이미 재고/픽업 시간대를 돌려줬으므로 다시 돌려주지 않습니다.
+    """
+    order_day = order.order_date.date()
+    snapshot = order_snapshot(order)
+    availability = {}
+    if order.status != 'cancelled':
+        availability = release_items(item_quantities([order.id]))
+        if order.pickup_slot:
+            release_slot(order.pickup_slot)
+    db.session.delete(order)
+    db.session.flush()
+    refresh_daily_sales([order_day])
+    return snapshot, availability
@@ -0,0 +1,141 @@
+"""픽업 시간대 예약과 시간대별 수용량 관리
+
+영업시간을 PICKUP_SLOT_MINUTES 단위 시간대로 나누고 시간대마다 최대 PICKUP_SLOT_CAPACITY건까지 주문을 받습니다.
+시간대별 예약 건수는 cafe_pickup_slot 테이블((매장, 시작 시각) 기본키)에 보관하므로,
+남은 수량 조회는 기본키 범위 조회 한 번이고 주문 테이블을 집계하지 않습니다.
+place_order는 주문과 같은 트랜잭션에서 조건부 UPDATE로 한 건씩 예약합니다.
+"""
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import bindparam, func, select, update
+from sqlalchemy.dialects.sqlite import insert
+
+from models import db, PickupSlot
+from stores import current_store
+
+SLOT_FORMAT = '%Y-%m-%dT%H:%M'
+
+def _clock(value):
+    """'HH:MM' -> time"""
+    return datetime.strptime(value, '%H:%M').time()
+
+def slot_starts(now=None):
+    """지금 예약할 수 있는 시간대 시작 시각 목록 (영업시간 내, 준비 시간 이후)"""
+    config = current_app.config
+    now = now or datetime.now()
+    step = timedelta(minutes=config['PICKUP_SLOT_MINUTES'])
+    earliest = now + timedelta(minutes=config['PICKUP_LEAD_MINUTES'])
+    starts = []
+    for offset in range(config['PICKUP_DAYS_AHEAD'] + 1):
+        day = now.date() + timedelta(days=offset)
+        slot = datetime.combine(day, _clock(config['PICKUP_OPEN']))
+        close = datetime.combine(day, _clock(config['PICKUP_CLOSE']))
+        while slot < close:
+            if slot >= earliest:
+                starts.append(slot)
+            slot += step
+    return starts
+
+def slot_label(slot_start, now=None):
+    """표시용 시간대 이름 (오늘이 아니면 날짜 포함)"""
+    now = now or datetime.now()
+    if slot_start.date() == now.date():
+        return slot_start.strftime('%H:%M')
+    return slot_start.strftime('%m/%d %H:%M')
+
+def _booked_counts(start, end):
+    """{시작 시각: (예약 건수, 수용량)} - 현재 매장의 [start, end] 구간"""
+    rows = db.session.execute(
+        select(PickupSlot.slot_start, PickupSlot.booked_count, PickupSlot.capacity)
+        .where(PickupSlot.store_id == current_store(),
+               PickupSlot.slot_start >= start, PickupSlot.slot_start <= end)
+    )
+    return {slot_start: (booked, capacity) for slot_start, booked, capacity in rows}
+
+def available_slots(now=None):
+    """예약 가능한 시간대와 남은 수량 목록"""
+    now = now or datetime.now()
+    starts = slot_starts(now)
+    if not starts:
+        return []
+    booked = _booked_counts(starts[0], starts[-1])
+    default_capacity = current_app.config['PICKUP_SLOT_CAPACITY']
+    slots = []
+    for slot_start in starts:
+        count, capacity = booked.get(slot_start, (0, default_capacity))
+        slots.append({
+            'slot': slot_start.strftime(SLOT_FORMAT),
+            'label': slot_label(slot_start, now),
+            'booked': count,
+            'capacity': capacity,
+            'remaining': max(capacity - count, 0),
+        })
+    return slots
+
+def upcoming_bookings(now=None, limit=12):
+    """관리자용 - 진행 중/다가오는 시간대 중 예약이 있는 시간대 (주방 준비량 확인)"""
+    now = now or datetime.now()
+    since = now - timedelta(minutes=current_app.config['PICKUP_SLOT_MINUTES'])
+    rows = db.session.execute(
+        select(PickupSlot.slot_start, PickupSlot.booked_count, PickupSlot.capacity)
+        .where(PickupSlot.store_id == current_store(),
+               PickupSlot.slot_start >= since, PickupSlot.booked_count > 0)
+        .order_by(PickupSlot.slot_start)
+        .limit(limit)
+    )
+    return [{'label': slot_label(slot_start, now), 'booked': booked, 'capacity': capacity}
+            for slot_start, booked, capacity in rows]
+
+def parse_slot(value, now=None):
+    """폼 값('YYYY-MM-DDTHH:MM') -> 시간대 시작 시각 (지금 예약할 수 없는 시간대면 None)"""
+    try:
+        slot_start = datetime.strptime(value, SLOT_FORMAT)
+    except (TypeError, ValueError):
+        return None
+    return slot_start if slot_start in slot_starts(now) else None
+
+def book_slot(slot_start, force=False):
+    """시간대 1건 예약 (커밋은 호출자가 담당)
+    
+    시간대 행이 없으면 만들고, 수용량이 남아 있을 때만 UPDATE ... SET booked_count = booked_count + 1로
+    예약합니다. 예약 후 건수를 담은 Row를 반환하며, 마감된 시간대면 None.
+    force=True이면 수용량을 넘어도 예약합니다 (관리자가 취소를 되돌리는 경우).
+    """
+    store_id = current_store()
+    db.session.execute(
+        insert(PickupSlot)
+        .values(store_id=store_id, slot_start=slot_start, booked_count=0,
+                capacity=current_app.config['PICKUP_SLOT_CAPACITY'])
+        .on_conflict_do_nothing(index_elements=[PickupSlot.store_id, PickupSlot.slot_start])
+    )
+    stmt = update(PickupSlot).where(PickupSlot.store_id == store_id, PickupSlot.slot_start == slot_start)
+    if not force:
+        stmt = stmt.where(PickupSlot.booked_count < PickupSlot.capacity)
+    stmt = stmt.values(booked_count=PickupSlot.booked_count + 1).returning(PickupSlot.booked_count)
+    return db.session.execute(stmt, execution_options={'synchronize_session': False}).first()
+
+def release_slot(slot_start):
+    """시간대 예약 1건 취소 (주문 삭제/취소 시, 커밋은 호출자가 담당)"""
+    db.session.execute(
+        update(PickupSlot)
+        .where(PickupSlot.store_id == current_store(), PickupSlot.slot_start == slot_start,
+               PickupSlot.booked_count > 0)
+        .values(booked_count=PickupSlot.booked_count - 1),
+        execution_options={'synchronize_session': False}
+    )
+
+def release_slots(counts):
+    """시간대별 예약 여러 건 한 번에 취소 (일괄 취소/삭제 시, 커밋은 호출자가 담당)
+
+    counts: {시간대 시작 시각: 취소할 건수} - 시간대마다 UPDATE 한 문장을 executemany로 실행합니다.
+    """
+    if not counts:
+        return
+    table = PickupSlot.__table__
+    db.session.execute(
+        table.update()
+        .where(table.c.store_id == current_store(), table.c.slot_start == bindparam('b_slot_start'))
+        .values(booked_count=func.max(table.c.booked_count - bindparam('b_released'), 0)),
+        [{'b_slot_start': slot_start, 'b_released': released} for slot_start, released in counts.items()]
+    )
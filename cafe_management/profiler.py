@@ -0,0 +1,197 @@
+"""관리자용 요청 프로파일러
+
+관리자가 프로파일링을 켜면(세션) 또는 관리자 요청에 ?profile=1을 붙이면 그 요청에서 실행된
+SQL과 실행 시간을 모으고, 응답 후 SELECT/UPDATE/DELETE마다 같은 DB에서 EXPLAIN QUERY PLAN을 실행해
+PROFILER_SCAN_TABLES(주문/주문항목)의 전체 스캔(SCAN)을 표시합니다.
+요청 시간이 PROFILER_SLOW_MS를 넘으면 요청 처리 중 주기적으로 수집한 파이썬 스택 샘플도 함께 남깁니다.
+
+결과는 워커(프로세스)마다 최근 PROFILER_HISTORY건을 메모리에 보관하며 /admin/profiler에서 확인합니다.
+프로파일링하지 않는 요청에는 SQL 이벤트 리스너의 ContextVar 조회 한 번 외에 비용이 없습니다.
+"""
+import re
+import sys
+import threading
+import time
+from collections import Counter, deque
+from contextvars import ContextVar
+from datetime import datetime
+from itertools import count
+
+from flask import current_app, request, session
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+_active = ContextVar('active_profile', default=None)
+_ids = count(1)
+
+# EXPLAIN QUERY PLAN의 전체 스캔 (SQLite 3.36 이전은 'SCAN TABLE 이름')
+SCAN_PATTERN = re.compile(r'^SCAN (?:TABLE )?(\w+)')
+EXPLAINABLE = ('SELECT', 'UPDATE', 'DELETE', 'WITH')
+STACK_DEPTH = 30  # 스택 샘플마다 보관할 안쪽 프레임 수
+
+class QueryRecord:
+    """요청 중 실행된 SQL 한 건"""
+
+    def __init__(self, engine, statement, parameters, executemany):
+        self.engine = engine
+        self.statement = statement
+        self.parameters = parameters
+        self.executemany = executemany
+        self.duration_ms = None
+        self.plan = []
+        self.full_scans = []
+        self.explain_error = None
+
+class RequestProfile:
+    """요청 하나의 프로파일"""
+
+    def __init__(self, method, path, endpoint):
+        self.id = next(_ids)
+        self.started_at = datetime.now()
+        self.method = method
+        self.path = path
+        self.endpoint = endpoint
+        self.status_code = None
+        self.duration_ms = None
+        self.queries = []
+        self.samples = Counter()
+        self.sample_count = 0
+        self._started = time.perf_counter()
+        self._stop = threading.Event()
+        self._sampler = None
+
+    @property
+    def sql_ms(self):
+        return sum(q.duration_ms or 0 for q in self.queries)
+
+    @property
+    def full_scan_count(self):
+        return sum(1 for q in self.queries if q.full_scans)
+
+    def top_stacks(self, limit=10):
+        return self.samples.most_common(limit)
+
+    def start_sampler(self, interval):
+        """요청 스레드의 스택을 interval초마다 수집 (느린 요청일 때만 결과를 남김)"""
+        thread_id = threading.get_ident()
+
+        def sample():
+            while not self._stop.wait(interval):
+                frame = sys._current_frames().get(thread_id)
+                if frame is None:
+                    continue
+                stack = []
+                while frame is not None and len(stack) < STACK_DEPTH:
+                    code = frame.f_code
+                    stack.append(f'{code.co_filename.rsplit("/", 1)[-1]}:{frame.f_lineno} {code.co_name}')
+                    frame = frame.f_back
+                self.samples['\n'.join(reversed(stack))] += 1
+                self.sample_count += 1
+
+        self._sampler = threading.Thread(target=sample, name=f'profiler-sampler-{self.id}', daemon=True)
+        self._sampler.start()
+
+    def stop_sampler(self):
+        if self._sampler is not None:
+            self._stop.set()
+            self._sampler.join()
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = _active.get()
+    if profile is not None:
+        record = QueryRecord(conn.engine, statement, parameters, executemany)
+        profile.queries.append(record)
+        # 실행 컨텍스트는 문장마다 새로 만들어지므로 SQL이 예외로 끝나도 연결에 남지 않음
+        context._profiler_timing = (record, time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    timing = getattr(context, '_profiler_timing', None)
+    if timing is not None:
+        record, started = timing
+        record.duration_ms = (time.perf_counter() - started) * 1000
+
+_listening = False
+
+def _listen():
+    # 모든 엔진(기본/매장별)에 한 번만 등록
+    global _listening
+    if not _listening:
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+        _listening = True
+
+def get_profiles():
+    """이 워커의 최근 프로파일 (deque, 최신이 앞)"""
+    profiles = current_app.extensions.get('profiles')
+    if profiles is None:
+        profiles = current_app.extensions.setdefault('profiles', deque(maxlen=current_app.config['PROFILER_HISTORY']))
+    return profiles
+
+def profiling_requested():
+    """이 요청을 프로파일링할지 (관리자만, 프로파일러 화면 자체는 제외)"""
+    if not session.get('admin_logged_in') or (request.endpoint or '').startswith('admin.profiler'):
+        return False
+    return session.get('profiling') or request.args.get('profile') == '1'
+
+def start_profiling():
+    """요청 시작 (before_request)"""
+    if request.endpoint == 'static' or not profiling_requested():
+        return
+    _listen()
+    profile = RequestProfile(request.method, request.full_path.rstrip('?'), request.endpoint)
+    profile.start_sampler(current_app.config['PROFILER_SAMPLE_INTERVAL'])
+    _active.set(profile)
+
+def explain(record, scan_tables):
+    """쿼리 한 건의 EXPLAIN QUERY PLAN 실행 후 전체 스캔 표시"""
+    if not record.statement.lstrip().upper().startswith(EXPLAINABLE):
+        return
+    parameters = record.parameters
+    if record.executemany and parameters:
+        parameters = parameters[0]
+    try:
+        with record.engine.connect() as conn:
+            rows = conn.exec_driver_sql('EXPLAIN QUERY PLAN ' + record.statement, parameters or ()).all()
+    except Exception as e:
+        record.explain_error = str(e)
+        return
+    record.plan = [row[-1] for row in rows]
+    for detail in record.plan:
+        match = SCAN_PATTERN.match(detail)
+        if match and match.group(1) in scan_tables:
+            record.full_scans.append(detail)
+
+def finish_profiling(response):
+    """요청 종료 (after_request) - 실행 계획 조회 후 보관"""
+    profile = _active.get()
+    if profile is None:
+        return response
+    _active.set(None)
+    profile.stop_sampler()
+    profile.duration_ms = (time.perf_counter() - profile._started) * 1000
+    profile.status_code = response.status_code
+
+    config = current_app.config
+    if profile.duration_ms < config['PROFILER_SLOW_MS']:
+        profile.samples.clear()
+        profile.sample_count = 0
+    plans = {}
+    for record in profile.queries:
+        # 같은 SQL은 한 번만 EXPLAIN
+        key = (record.engine.url, record.statement)
+        if key not in plans:
+            explain(record, config['PROFILER_SCAN_TABLES'])
+            plans[key] = record
+        else:
+            first = plans[key]
+            record.plan, record.full_scans, record.explain_error = first.plan, first.full_scans, first.explain_error
+        record.engine = None  # 보관 중 엔진 참조를 들고 있지 않도록
+    get_profiles().appendleft(profile)
+    return response
+
+def stop_profiling(exc=None):
+    """예외로 after_request가 실행되지 않은 경우 샘플러 정리 (teardown_request)"""
+    profile = _active.get()
+    if profile is not None:
+        _active.set(None)
+        profile.stop_sampler()
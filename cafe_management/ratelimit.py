@@ -0,0 +1,216 @@
+"""요청 제한(토큰 버킷)과 쓰기 요청 admission 제어
+
+- rate_limit(name): 세션/IP별 토큰 버킷. 한도는 config.RATE_LIMITS에서 설정합니다.
+  RATELIMIT_BACKEND = 'memory'는 워커(프로세스)별 카운터,
+  'sqlite'는 로컬 SQLite 파일 하나를 모든 워커가 공유합니다.
+- write_admission: SQLite는 쓰기가 한 번에 하나씩만 가능하므로 동시에 DB에 쓰는 요청 수를
+  제한하고, 대기열이 가득 차거나 대기 시간이 지나면 바로 "잠시 후 다시 시도" 응답을 돌려줍니다.
+"""
+import math
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+from flask import current_app, request, session, redirect, url_for, flash, jsonify
+
+def _refill(tokens, updated_at, now, capacity, rate):
+    """마지막 갱신 이후 충전된 토큰 수 계산"""
+    return min(capacity, tokens + (now - updated_at) * rate)
+
+def _full_at(tokens, now, capacity, rate):
+    """버킷이 다시 가득 차는 시각 (이후에는 지워도 결과가 같음)"""
+    return now + (capacity - tokens) / rate
+
+class MemoryBackend:
+    """프로세스 내 토큰 버킷 저장소 (최대 MAX_KEYS개, 넘으면 오래 쓰지 않은 버킷부터 제거)"""
+    MAX_KEYS = 10000
+    PRUNE_TO = 9000  # 정리할 때 이 개수까지 줄여 매 요청마다 정리하지 않도록 함
+
+    def __init__(self):
+        self._buckets = OrderedDict()  # key -> (tokens, updated_at, full_at), 최근 사용한 순서
+        self._lock = threading.Lock()
+
+    def take(self, key, capacity, rate):
+        """토큰 1개 사용 시도 -> (허용 여부, 재시도까지 남은 초)"""
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.pop(key, None)
+            tokens = capacity if bucket is None else _refill(bucket[0], bucket[1], now, capacity, rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            if len(self._buckets) >= self.MAX_KEYS:
+                self._prune(now)
+            self._buckets[key] = (tokens, now, _full_at(tokens, now, capacity, rate))
+        return allowed, 0 if allowed else (1 - tokens) / rate
+
+    def _prune(self, now):
+        # 가득 충전된 버킷(버킷마다 자기 한도로 계산)은 지워도 결과가 같음
+        full = [k for k, (tokens, updated_at, full_at) in self._buckets.items() if full_at <= now]
+        for k in full:
+            del self._buckets[k]
+        # 그래도 많으면 가장 오래 쓰지 않은 버킷부터 제거
+        while len(self._buckets) > self.PRUNE_TO:
+            self._buckets.popitem(last=False)
+
+class SQLiteBackend:
+    """로컬 SQLite 파일로 워커 간 토큰 버킷 공유 (가득 찬 버킷은 PRUNE_INTERVAL초마다 삭제)"""
+    PRUNE_INTERVAL = 60
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._pruned_at = time.time()
+        conn = self._connection()
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS rate_bucket ('
+            'key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL, full_at REAL NOT NULL)'
+        )
+        columns = [row[1] for row in conn.execute('PRAGMA table_info(rate_bucket)')]
+        if 'full_at' not in columns:
+            # 이전 형식의 카운터 파일 - 기존 버킷은 다음 정리 때 삭제됨
+            conn.execute('ALTER TABLE rate_bucket ADD COLUMN full_at REAL NOT NULL DEFAULT 0')
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=1.0, isolation_level=None, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=OFF')  # 카운터는 유실되어도 무방
+            self._local.conn = conn
+        return conn
+
+    def take(self, key, capacity, rate):
+        """토큰 1개 사용 시도 -> (허용 여부, 재시도까지 남은 초)"""
+        conn = self._connection()
+        now = time.time()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute('SELECT tokens, updated_at FROM rate_bucket WHERE key = ?', (key,)).fetchone()
+            tokens = capacity if row is None else _refill(row[0], row[1], now, capacity, rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            conn.execute(
+                'INSERT INTO rate_bucket (key, tokens, updated_at, full_at) VALUES (?, ?, ?, ?) '
+                'ON CONFLICT(key) DO UPDATE SET tokens = excluded.tokens, updated_at = excluded.updated_at, '
+                'full_at = excluded.full_at',
+                (key, tokens, now, _full_at(tokens, now, capacity, rate))
+            )
+            if now - self._pruned_at >= self.PRUNE_INTERVAL:
+                self._pruned_at = now
+                conn.execute('DELETE FROM rate_bucket WHERE full_at <= ?', (now,))
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return allowed, 0 if allowed else (1 - tokens) / rate
+
+def get_backend():
+    """앱 설정에 맞는 저장소 (앱마다 1개)"""
+    backend = current_app.extensions.get('ratelimit_backend')
+    if backend is None:
+        if current_app.config['RATELIMIT_BACKEND'] == 'sqlite':
+            path = os.path.join(current_app.instance_path, current_app.config['RATELIMIT_SQLITE_PATH'])
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            backend = SQLiteBackend(path)
+        else:
+            backend = MemoryBackend()
+        backend = current_app.extensions.setdefault('ratelimit_backend', backend)
+    return backend
+
+def _client_key(key_type):
+    """버킷 키: 'ip'는 클라이언트 IP, 'session'은 세션 ID (세션 쿠키를 보내지 않은 요청은 IP)"""
+    ip = request.remote_addr or 'unknown'
+    # 쿠키 없는 요청은 매번 새 세션 ID를 받으므로 그 ID로는 제한이 걸리지 않음
+    if key_type == 'session' and request.cookies.get(current_app.config['SESSION_COOKIE_NAME']):
+        sid = getattr(session, 'sid', None)
+        if sid:
+            return f'sid:{sid}'
+    return f'ip:{ip}'
+
+def busy_response(message, status_code, retry_after):
+    """과부하/요청 제한 응답 - AJAX는 JSON, 일반 폼은 flash 후 이전 페이지로 이동"""
+    retry_after = max(1, math.ceil(retry_after))
+    if request.is_json or request.accept_mimetypes.best == 'application/json':
+        response = jsonify({'success': False, 'busy': True, 'error': message, 'retry_after': retry_after})
+        response.status_code = status_code
+    else:
+        flash(message, 'error')
+        response = redirect(request.referrer or url_for('main.index'))
+    response.headers['Retry-After'] = str(retry_after)
+    return response
+
+def rate_limit(name, methods=('POST',)):
+    """토큰 버킷 요청 제한 데코레이터 (config.RATE_LIMITS[name] = (최대 요청 수, 충전 주기(초), 키 기준))"""
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            if current_app.config['RATELIMIT_ENABLED'] and request.method in methods:
+                capacity, period, key_type = current_app.config['RATE_LIMITS'][name]
+                try:
+                    allowed, retry_after = get_backend().take(f'{name}:{_client_key(key_type)}',
+                                                              capacity, capacity / period)
+                except sqlite3.Error as e:
+                    # 카운터 저장소 문제로 주문을 막지 않도록 허용
+                    current_app.logger.warning('rate limit backend error: %s', e)
+                    allowed, retry_after = True, 0
+                if not allowed:
+                    return busy_response('요청이 너무 많습니다. 잠시 후 다시 시도해주세요.', 429, retry_after)
+            return f(*args, **kwargs)
+        return decorated_function
+    return decorator
+
+class WriteAdmission:
+    """동시 쓰기 요청 수 제한 + 제한된 크기의 대기열"""
+
+    def __init__(self, concurrency, queue_size, timeout):
+        self._slots = threading.BoundedSemaphore(concurrency)
+        self._lock = threading.Lock()
+        self._waiting = 0
+        self.queue_size = queue_size
+        self.timeout = timeout
+
+    def acquire(self):
+        """쓰기 슬롯 획득 (대기열이 가득 찼거나 시간 초과면 False)"""
+        if self._slots.acquire(blocking=False):
+            return True
+        with self._lock:
+            if self._waiting >= self.queue_size:
+                return False
+            self._waiting += 1
+        try:
+            return self._slots.acquire(timeout=self.timeout)
+        finally:
+            with self._lock:
+                self._waiting -= 1
+
+    def release(self):
+        self._slots.release()
+
+def get_admission():
+    """앱 설정에 맞는 admission 제어기 (앱마다 1개)"""
+    admission = current_app.extensions.get('write_admission')
+    if admission is None:
+        admission = WriteAdmission(current_app.config['WRITE_CONCURRENCY'],
+                                   current_app.config['WRITE_QUEUE_SIZE'],
+                                   current_app.config['WRITE_QUEUE_TIMEOUT'])
+        admission = current_app.extensions.setdefault('write_admission', admission)
+    return admission
+
+def write_admission(f):
+    """DB 쓰기 요청 admission 제어 데코레이터"""
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        admission = get_admission()
+        if not admission.acquire():
+            return busy_response('주문이 몰려 처리 중입니다. 잠시 후 다시 시도해주세요.', 503,
+                                 admission.timeout)
+        try:
+            return f(*args, **kwargs)
+        finally:
+            admission.release()
+    return decorated_function
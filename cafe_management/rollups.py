@@ -0,0 +1,96 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from sqlalchemy import func, select
+from sqlalchemy.dialects.sqlite import insert
+
+from models import db, Order, DailySales
+from stores import current_store, store_names, store_shards
+
+def day_range(day):
+    """해당 날짜의 [시작, 다음날 시작) 범위 (order_date 인덱스를 타도록 범위 조건 사용)"""
+    start = datetime.combine(day, datetime.min.time())
+    return start, start + timedelta(days=1)
+
+def refresh_daily_sales(days, store_id=None):
+    """지정한 날짜들의 매장별 일별 매출 롤업을 주문 테이블에서 다시 계산 (커밋은 호출자가 담당)"""
+    store_id = store_id or current_store()
+    now = datetime.now()
+    for day in set(days):
+        start, end = day_range(day)
+        order_count, total_amount = db.session.execute(
+            select(func.count(Order.id), func.coalesce(func.sum(Order.total_amount), 0))
+            .where(Order.store_id == store_id, Order.order_date >= start, Order.order_date < end)
+        ).one()
+
+        stmt = insert(DailySales).values(
+            store_id=store_id, sales_date=day, order_count=order_count, total_amount=total_amount, updated_at=now
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[DailySales.store_id, DailySales.sales_date],
+            set_={'order_count': stmt.excluded.order_count,
+                  'total_amount': stmt.excluded.total_amount,
+                  'updated_at': stmt.excluded.updated_at}
+        )
+        db.session.execute(stmt)
+
+def rebuild_daily_sales():
+    """현재 DB의 전체 일별 매출 롤업 재생성 (대량 시딩/복구용)"""
+    db.session.execute(DailySales.__table__.delete())
+    rows = db.session.execute(
+        select(Order.store_id, func.date(Order.order_date), func.count(Order.id), func.sum(Order.total_amount))
+        .group_by(Order.store_id, func.date(Order.order_date))
+    ).all()
+    now = datetime.now()
+    if rows:
+        db.session.execute(insert(DailySales), [
+            {'store_id': store_id, 'sales_date': datetime.strptime(day, '%Y-%m-%d').date(),
+             'order_count': count, 'total_amount': total or 0, 'updated_at': now}
+            for store_id, day, count, total in rows
+        ])
+
+def sales_summary(day):
+    """대시보드용 현재 매장 (당일 매출, 당일 주문수, 전체 주문수, 전체 매출)"""
+    store_id = current_store()
+    today = db.session.get(DailySales, (store_id, day))
+    total_orders, total_sales = db.session.execute(
+        select(func.coalesce(func.sum(DailySales.order_count), 0),
+               func.coalesce(func.sum(DailySales.total_amount), 0))
+        .where(DailySales.store_id == store_id)
+    ).one()
+    return (today.total_amount if today else 0,
+            today.order_count if today else 0,
+            total_orders,
+            total_sales)
+
+def _shard_sales(engine, store_ids, start_date, end_date):
+    """샤드 하나의 매장별 (주문수, 매출) 집계"""
+    stmt = (select(DailySales.store_id,
+                   func.coalesce(func.sum(DailySales.order_count), 0),
+                   func.coalesce(func.sum(DailySales.total_amount), 0))
+            .where(DailySales.store_id.in_(store_ids))
+            .group_by(DailySales.store_id))
+    if start_date:
+        stmt = stmt.where(DailySales.sales_date >= start_date)
+    if end_date:
+        stmt = stmt.where(DailySales.sales_date <= end_date)
+    with engine.connect() as conn:
+        return {store_id: (count, total) for store_id, count, total in conn.execute(stmt)}
+
+def store_sales_report(start_date=None, end_date=None):
+    """매장 간 매출 보고서 - 매장 DB(샤드)마다 병렬로 일별 매출 롤업을 집계
+    
+    반환: 매장 설정 순서대로 {'store_id', 'store_name', 'order_count', 'total_amount'} 목록
+    """
+    shards = store_shards()
+    results = {}
+    with ThreadPoolExecutor(max_workers=len(shards)) as executor:
+        futures = [executor.submit(_shard_sales, engine, store_ids, start_date, end_date)
+                   for engine, store_ids in shards]
+        for future in futures:
+            results.update(future.result())
+    return [
+        {'store_id': store_id, 'store_name': name,
+         'order_count': results.get(store_id, (0, 0))[0],
+         'total_amount': results.get(store_id, (0, 0))[1]}
+        for store_id, name in store_names().items()
+    ]
@@ -0,0 +1,11 @@
+from routes.main import main_bp
+from routes.user import user_bp
+from routes.admin import admin_bp
+from routes.menu import menu_bp
+from routes.orders import orders_bp
+from routes.data_io import data_io_bp
+
+def register_blueprints(app):
+    """라우트 블루프린트 등록"""
+    for bp in (main_bp, user_bp, admin_bp, menu_bp, orders_bp, data_io_bp):
+        app.register_blueprint(bp)
@@ -0,0 +1,202 @@
+from datetime import datetime
+from flask import Blueprint, current_app, render_template, request, redirect, url_for, session, flash, abort
+
+from models import db, Menu, Order
+from pickup import upcoming_bookings
+from profiler import get_profiles
+from ratelimit import rate_limit
+from rollups import day_range, sales_summary, store_sales_report
+from stores import current_store
+from utils import admin_required
+
+admin_bp = Blueprint('admin', __name__)
+
+@admin_bp.route('/admin/login', methods=['GET', 'POST'])
+@rate_limit('admin_login')
+def admin_login():
+    """관리자 로그인"""
+    if request.method == 'POST':
+        username = request.form['username']
+        password = request.form['password']
+        
+        if username == current_app.config['ADMIN_USERNAME'] and password == current_app.config['ADMIN_PASSWORD']:
+            session['admin_logged_in'] = True
+            flash('관리자로 로그인되었습니다.', 'success')
+            return redirect(url_for('admin.admin_dashboard'))
+        else:
+            flash('아이디 또는 비밀번호가 잘못되었습니다.', 'error')
+    
+    return render_template('admin/login.html')
+
+@admin_bp.route('/admin/logout')
+@admin_required
+def admin_logout():
+    """관리자 로그아웃"""
+    session.pop('admin_logged_in', None)
+    flash('로그아웃되었습니다.', 'success')
+    return redirect(url_for('main.index'))
+
+@admin_bp.route('/admin')
+@admin_required
+def admin_dashboard():
+    """관리자 대시보드"""
+    # 오늘/전체 통계 (일별 매출 롤업에서 조회)
+    today_sales, today_count, total_orders, total_sales = sales_summary(datetime.now().date())
+    
+    # 최근 주문 5개
+    recent_orders = Order.query.filter_by(store_id=current_store()).order_by(Order.order_date.desc()).limit(5).all()
+    
+    # 다가오는 픽업 시간대별 예약 건수
+    pickup_bookings = upcoming_bookings()
+    
+    return render_template('admin/sales.html', 
+                         today_sales=today_sales, 
+                         today_count=today_count,
+                         recent_orders=recent_orders,
+                         pickup_bookings=pickup_bookings,
+                         total_orders=total_orders,
+                         total_sales=total_sales)
+
+@admin_bp.route('/admin/sales')
+@admin_required
+def admin_sales():
+    """매출 관리"""
+    return redirect(url_for('admin.admin_dashboard'))
+
+@admin_bp.route('/admin/sales/filter', methods=['POST'])
+@admin_required
+def filter_sales():
+    """매출 필터링"""
+    try:
+        start_date = request.form.get('start_date')
+        end_date = request.form.get('end_date')
+        
+        query = Order.query.filter_by(store_id=current_store())
+        
+        if start_date:
+            start_date = datetime.strptime(start_date, '%Y-%m-%d').date()
+            query = query.filter(Order.order_date >= day_range(start_date)[0])
+        
+        if end_date:
+            end_date = datetime.strptime(end_date, '%Y-%m-%d').date()
+            query = query.filter(Order.order_date < day_range(end_date)[1])
+        
+        orders = query.order_by(Order.order_date.desc()).all()
+        total_sales = sum(order.total_amount for order in orders)
+        
+        return render_template('admin/order_list.html', 
+                             orders=orders, 
+                             total_sales=total_sales,
+                             start_date=start_date,
+                             end_date=end_date)
+        
+    except Exception as e:
+        flash(f'필터링 중 오류가 발생했습니다: {str(e)}', 'error')
+        return redirect(url_for('admin.admin_dashboard'))
+
+@admin_bp.route('/admin/stores/report')
+@admin_required
+def store_report():
+    """매장별 매출 비교 (매장 DB마다 병렬 집계)"""
+    try:
+        start_date = request.args.get('start_date', type=lambda v: datetime.strptime(v, '%Y-%m-%d').date())
+        end_date = request.args.get('end_date', type=lambda v: datetime.strptime(v, '%Y-%m-%d').date())
+        
+        rows = store_sales_report(start_date, end_date)
+        total_count = sum(row['order_count'] for row in rows)
+        total_amount = sum(row['total_amount'] for row in rows)
+        
+        return render_template('admin/store_report.html',
+                             rows=rows,
+                             total_count=total_count,
+                             total_amount=total_amount,
+                             start_date=start_date,
+                             end_date=end_date)
+        
+    except Exception as e:
+        flash(f'매장별 매출 조회 중 오류가 발생했습니다: {str(e)}', 'error')
+        return redirect(url_for('admin.admin_dashboard'))
+
+
+# ====================== 쿼리 프로파일러 ======================
+
+@admin_bp.route('/admin/profiler')
+@admin_required
+def profiler():
+    """최근 프로파일 목록 (이 워커에서 처리한 요청만)"""
+    return render_template('admin/profiler.html', profiles=list(get_profiles()), selected=None,
+                           profiling=session.get('profiling', False))
+
+@admin_bp.route('/admin/profiler/<int:profile_id>')
+@admin_required
+def profiler_detail(profile_id):
+    """프로파일 상세: SQL, 실행 시간, 실행 계획, 스택 샘플"""
+    profiles = list(get_profiles())
+    selected = next((profile for profile in profiles if profile.id == profile_id), None)
+    if selected is None:
+        abort(404)
+    return render_template('admin/profiler.html', profiles=profiles, selected=selected,
+                           profiling=session.get('profiling', False))
+
+@admin_bp.route('/admin/profiler/toggle', methods=['POST'])
+@admin_required
+def profiler_toggle():
+    """이 관리자 세션의 모든 요청 프로파일링 켜기/끄기"""
+    session['profiling'] = not session.get('profiling', False)
+    flash('프로파일링을 켰습니다. 확인할 페이지를 연 뒤 이 화면으로 돌아오세요.' if session['profiling']
+          else '프로파일링을 껐습니다.', 'success')
+    return redirect(url_for('admin.profiler'))
+
+@admin_bp.route('/admin/profiler/clear', methods=['POST'])
+@admin_required
+def profiler_clear():
+    """보관 중인 프로파일 삭제"""
+    get_profiles().clear()
+    return redirect(url_for('admin.profiler'))
+
+
+# ====================== 카테고리 관리 ======================
+
+@admin_bp.route('/admin/categories')
+@admin_required
+def admin_categories():
+    """카테고리 관리"""
+    categories = db.session.query(Menu.category).filter_by(store_id=current_store()).distinct().all()
+    categories = [cat[0] for cat in categories]
+    return render_template('admin/categories.html', categories=categories)
+
+@admin_bp.route('/admin/categories', methods=['POST'])
+@admin_required
+def add_category():
+    """카테고리 추가"""
+    try:
+        category_name = request.form['category_name'].strip()
+        if category_name:
+            # 이미 존재하는지 확인
+            existing = db.session.query(Menu.category).filter_by(store_id=current_store(), category=category_name).first()
+            if not existing:
+                flash(f'카테고리 "{category_name}"가 추가되었습니다.', 'success')
+            else:
+                flash('이미 존재하는 카테고리입니다.', 'error')
+        else:
+            flash('카테고리 이름을 입력해주세요.', 'error')
+    except Exception as e:
+        flash(f'카테고리 추가 중 오류가 발생했습니다: {str(e)}', 'error')
+    
+    return redirect(url_for('admin.admin_categories'))
+
+@admin_bp.route('/admin/categories/delete/<category>', methods=['POST'])
+@admin_required
+def delete_category(category):
+    """카테고리 삭제"""
+    try:
+        # 해당 카테고리의 메뉴가 있는지 확인
+        menus_count = Menu.query.filter_by(store_id=current_store(), category=category).count()
+        if menus_count > 0:
+            flash(f'카테고리 "{category}"에 {menus_count}개의 메뉴가 있습니다. 먼저 메뉴를 삭제하거나 다른 카테고리로 이동해주세요.', 'error')
+        else:
+            flash(f'카테고리 "{category}"가 삭제되었습니다.', 'success')
+    except Exception as e:
+        flash(f'카테고리 삭제 중 오류가 발생했습니다: {str(e)}', 'error')
+    
+    return redirect(url_for('admin.admin_categories'))
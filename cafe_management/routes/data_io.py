@@ -0,0 +1,211 @@
+import tempfile
+from datetime import datetime
+from io import BytesIO
+from flask import Blueprint, current_app, render_template, request, redirect, url_for, flash, send_file
+from sqlalchemy import func, select
+
+from events import ORDER_CREATED, order_snapshot, record_event
+from exports import order_date_bounds, parallel_export
+from models import db, Order
+from rollups import day_range, refresh_daily_sales
+from stores import current_store, store_engine, store_names
+from utils import admin_required
+
+data_io_bp = Blueprint('data_io', __name__)
+
+def _orders_to_excel(orders):
+    """주문 목록을 Excel(BytesIO)로 변환"""
+    # pandas/xlsxwriter는 무거우므로 내보내기 시점에만 임포트
+    import pandas as pd
+    
+    data = []
+    for order in orders:
+        for item in order.order_items:
+            data.append({
+                '매장': store_names().get(order.store_id, order.store_id),
+                '주문번호': order.id,
+                '주문일시': order.order_date.strftime('%Y-%m-%d %H:%M:%S'),
+                '고객명': order.customer_name,
+                '배달위치': order.delivery_location,
+                '배달시간': order.delivery_time or '',
+                '픽업시간대': order.pickup_slot.strftime('%Y-%m-%d %H:%M') if order.pickup_slot else '',
+                '메뉴명': item.menu.name if item.menu else '삭제된 메뉴',
+                '수량': item.quantity,
+                '온도': item.temperature,
+                '특별요청': item.special_request or '',
+                '소계': item.subtotal,
+                '총액': order.total_amount,
+                '상태': order.status,
+                '주문요청사항': order.order_request or ''
+            })
+    
+    df = pd.DataFrame(data)
+    
+    # Excel 파일로 저장
+    output = BytesIO()
+    with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
+        df.to_excel(writer, sheet_name='주문내역', index=False)
+    
+    output.seek(0)
+    return output
+
+def _use_parallel_export(start=None, end=None):
+    """월별 CSV ZIP(멀티프로세스)으로 내보낼지 - ?format=zip이거나 주문이 EXPORT_PARALLEL_MIN_ORDERS건을 넘을 때"""
+    stmt = select(func.count(Order.id)).where(Order.store_id == current_store())
+    if start:
+        stmt = stmt.where(Order.order_date >= start)
+    if end:
+        stmt = stmt.where(Order.order_date < end)
+    order_count = db.session.execute(stmt).scalar()
+    if not order_count:
+        return False
+    return request.values.get('format') == 'zip' or order_count > current_app.config['EXPORT_PARALLEL_MIN_ORDERS']
+
+def _parallel_export_response(start, end, name):
+    """[start, end) 주문을 월별 CSV ZIP으로 내보내는 응답"""
+    store_id = current_store()
+    start, end = order_date_bounds(db.session, store_id, start, end)
+    output = tempfile.TemporaryFile()
+    parallel_export(store_engine().url.render_as_string(hide_password=False), store_id,
+                    store_names().get(store_id, store_id), start, end, output,
+                    months=current_app.config['EXPORT_CHUNK_MONTHS'],
+                    processes=current_app.config['EXPORT_PROCESSES'])
+    output.seek(0)
+    return send_file(
+        output,
+        mimetype='application/zip',
+        as_attachment=True,
+        download_name=f"{name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip"
+    )
+
+@data_io_bp.route('/admin/export_all_orders')
+@admin_required
+def export_all_orders():
+    """전체 주문 내역 내보내기 (대용량이면 월별 CSV ZIP)"""
+    try:
+        if _use_parallel_export():
+            return _parallel_export_response(None, None, '전체주문내역')
+        
+        orders = Order.query.filter_by(store_id=current_store()).order_by(Order.order_date.desc()).all()
+        
+        output = _orders_to_excel(orders)
+        
+        filename = f"전체주문내역_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
+        
+        return send_file(
+            output,
+            mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+            as_attachment=True,
+            download_name=filename
+        )
+        
+    except Exception as e:
+        flash(f'내보내기 중 오류가 발생했습니다: {str(e)}', 'error')
+        return redirect(url_for('admin.admin_dashboard'))
+
+@data_io_bp.route('/admin/export_period_orders', methods=['POST'])
+@admin_required
+def export_period_orders():
+    """기간별 주문 내역 내보내기 (대용량이면 월별 CSV ZIP)"""
+    try:
+        start_date = request.form.get('start_date')
+        end_date = request.form.get('end_date')
+        
+        query = Order.query.filter_by(store_id=current_store())
+        start = end = None
+        
+        if start_date:
+            start_date = datetime.strptime(start_date, '%Y-%m-%d').date()
+            start = day_range(start_date)[0]
+            query = query.filter(Order.order_date >= start)
+        
+        if end_date:
+            end_date = datetime.strptime(end_date, '%Y-%m-%d').date()
+            end = day_range(end_date)[1]
+            query = query.filter(Order.order_date < end)
+        
+        if _use_parallel_export(start, end):
+            return _parallel_export_response(start, end, f'주문내역_{start_date}_{end_date}')
+        
+        orders = query.order_by(Order.order_date.desc()).all()
+        
+        output = _orders_to_excel(orders)
+        
+        filename = f"주문내역_{start_date}_{end_date}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
+        
+        return send_file(
+            output,
+            mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+            as_attachment=True,
+            download_name=filename
+        )
+        
+    except Exception as e:
+        flash(f'내보내기 중 오류가 발생했습니다: {str(e)}', 'error')
+        return redirect(url_for('admin.admin_dashboard'))
+
+@data_io_bp.route('/admin/import_orders', methods=['GET', 'POST'])
+@admin_required
+def import_orders():
+    """주문 데이터 가져오기"""
+    if request.method == 'POST':
+        try:
+            if 'file' not in request.files:
+                flash('파일을 선택해주세요.', 'error')
+                return redirect(request.url)
+            
+            file = request.files['file']
+            if file.filename == '':
+                flash('파일을 선택해주세요.', 'error')
+                return redirect(request.url)
+            
+            if file and file.filename.endswith(('.xlsx', '.xls')):
+                import pandas as pd
+                
+                df = pd.read_excel(file)
+                
+                imported_count = 0
+                error_count = 0
+                imported_orders = []
+                
+                for _, row in df.iterrows():
+                    try:
+                        # 필수 컬럼 확인
+                        if pd.isna(row.get('고객명')) or pd.isna(row.get('배달위치')):
+                            error_count += 1
+                            continue
+                        
+                        order = Order(
+                            store_id=current_store(),
+                            customer_name=str(row['고객명']),
+                            delivery_location=str(row['배달위치']),
+                            delivery_time=str(row.get('배달시간', '')),
+                            order_request=str(row.get('주문요청사항', '')),
+                            total_amount=int(row.get('총액', 0)),
+                            status=str(row.get('상태', 'pending'))
+                        )
+                        
+                        db.session.add(order)
+                        imported_orders.append(order)
+                        imported_count += 1
+                        
+                    except Exception as e:
+                        error_count += 1
+                        continue
+                
+                db.session.flush()
+                refresh_daily_sales([datetime.now().date()])
+                snapshots = [(order.id, order_snapshot(order)) for order in imported_orders]
+                db.session.commit()
+                for order_id, snapshot in snapshots:
+                    record_event(ORDER_CREATED, order_id, **snapshot)
+                flash(f'총 {imported_count}개의 주문이 가져왔습니다. (오류: {error_count}개)', 'success')
+                
+            else:
+                flash('Excel 파일(.xlsx, .xls)만 업로드 가능합니다.', 'error')
+                
+        except Exception as e:
+            db.session.rollback()
+            flash(f'파일 가져오기 중 오류가 발생했습니다: {str(e)}', 'error')
+    
+    return render_template('admin/import_orders.html')
@@ -0,0 +1,246 @@
+import os
+from datetime import datetime
+from flask import Blueprint, current_app, render_template, request, redirect, url_for, flash, jsonify
+from sqlalchemy import case, func, literal
+from werkzeug.utils import secure_filename
+
+from models import db, Menu
+from menu_cache import get_menu_cache
+from stores import current_store, store_get_or_404
+from utils import admin_required, allowed_file, conflict_response, versioned_update
+
+menu_bp = Blueprint('menu', __name__)
+
+def _remove_upload(filename):
+    """업로드 폴더의 이미지 파일 삭제 (없으면 무시)"""
+    if filename:
+        path = os.path.join(current_app.config['UPLOAD_FOLDER'], filename)
+        if os.path.exists(path):
+            os.remove(path)
+
+def _stock_value(form):
+    """재고 입력값 (비워두면 재고 관리 안 함)"""
+    stock = form.get('stock', '').strip()
+    return max(int(stock), 0) if stock else None
+
+def _stock_changes(form, menu):
+    """수정 화면의 재고 입력 -> UPDATE 값 (재고를 바꾸지 않았으면 빈 dict)
+
+    주문의 재고 차감은 version을 올리지 않으므로 입력값을 그대로 저장하면 화면을 연 뒤 팔린 수량이 되살아납니다.
+    화면을 열 때의 재고(original_stock)와 달라진 만큼만 stock = stock + (입력 - 원래 값)으로 반영합니다.
+    """
+    stock = _stock_value(form)
+    if 'original_stock' in form:
+        original = _stock_value({'stock': form['original_stock']})
+    else:
+        original = menu.stock  # 원래 재고를 보내지 않는 클라이언트 호환
+    if stock == original:
+        return {}
+    if stock is None:
+        return {'stock': None}  # 재고 관리 중단
+    if original is None:
+        new_stock = literal(stock)  # 재고 관리 시작
+    else:
+        new_stock = func.max(Menu.stock + (stock - original), 0)
+    return {
+        'stock': new_stock,
+        # 재고가 0이 되면 품절, 0이어서 자동 품절된 메뉴는 재입고하면 판매 재개
+        'is_soldout': case((new_stock <= 0, True), (Menu.stock <= 0, False), else_=Menu.is_soldout),
+    }
+
+@menu_bp.route('/admin/menu')
+@admin_required
+def admin_menu():
+    """메뉴 관리"""
+    category = request.args.get('category', '')
+    
+    if category:
+        menus = Menu.query.filter_by(store_id=current_store(), category=category).order_by(Menu.display_order, Menu.id).all()
+    else:
+        menus = Menu.query.filter_by(store_id=current_store()).order_by(Menu.display_order, Menu.id).all()
+    
+    categories = db.session.query(Menu.category).filter_by(store_id=current_store()).distinct().all()
+    categories = [cat[0] for cat in categories]
+    
+    return render_template('admin/menu.html', menus=menus, categories=categories, selected_category=category)
+
+@menu_bp.route('/admin/menu/add', methods=['GET', 'POST'])
+@admin_required
+def add_menu():
+    """메뉴 추가"""
+    if request.method == 'POST':
+        try:
+            name = request.form['name']
+            category = request.form['category']
+            price = float(request.form['price'])
+            description = request.form.get('description', '')
+            temperature_option = request.form.get('temperature_option', 'both')
+            display_order = int(request.form.get('display_order', 9999))
+            stock = _stock_value(request.form)
+            
+            # 이미지 업로드 처리
+            image_filename = None
+            if 'image' in request.files:
+                file = request.files['image']
+                if file and file.filename != '' and allowed_file(file.filename):
+                    filename = secure_filename(file.filename)
+                    # 고유한 파일명 생성
+                    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_')
+                    filename = timestamp + filename
+                    file.save(os.path.join(current_app.config['UPLOAD_FOLDER'], filename))
+                    image_filename = filename
+            
+            menu = Menu(
+                store_id=current_store(),
+                name=name,
+                category=category,
+                price=price,
+                description=description,
+                image=image_filename,
+                temperature_option=temperature_option,
+                display_order=display_order,
+                stock=stock,
+                is_soldout=stock == 0
+            )
+            
+            db.session.add(menu)
+            db.session.commit()
+            get_menu_cache().invalidate()
+            
+            flash('메뉴가 추가되었습니다.', 'success')
+            return redirect(url_for('menu.admin_menu'))
+            
+        except Exception as e:
+            db.session.rollback()
+            flash(f'메뉴 추가 중 오류가 발생했습니다: {str(e)}', 'error')
+    
+    # 기존 카테고리 목록
+    categories = db.session.query(Menu.category).filter_by(store_id=current_store()).distinct().all()
+    categories = [cat[0] for cat in categories]
+    
+    return render_template('admin/add_menu.html', categories=categories)
+
+@menu_bp.route('/admin/menu/edit/<int:menu_id>', methods=['GET', 'POST'])
+@admin_required
+def edit_menu(menu_id):
+    """메뉴 수정"""
+    menu = store_get_or_404(Menu, menu_id)
+    status_code = 200
+    
+    if request.method == 'POST':
+        old_image = menu.image
+        new_image = None
+        try:
+            values = {
+                'name': request.form['name'],
+                'category': request.form['category'],
+                'price': float(request.form['price']),
+                'description': request.form.get('description', ''),
+                'temperature_option': request.form.get('temperature_option', 'both'),
+                'display_order': int(request.form.get('display_order', 9999)),
+                **_stock_changes(request.form, menu),
+            }
+            
+            # 이미지 업로드 처리
+            if 'image' in request.files:
+                file = request.files['image']
+                if file and file.filename != '' and allowed_file(file.filename):
+                    # 새 이미지 저장 (기존 이미지는 수정이 반영된 뒤 삭제)
+                    filename = secure_filename(file.filename)
+                    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_')
+                    new_image = timestamp + filename
+                    file.save(os.path.join(current_app.config['UPLOAD_FOLDER'], new_image))
+                    values['image'] = new_image
+            
+            # 화면을 연 뒤 다른 관리자가 수정했다면 덮어쓰지 않음
+            if versioned_update(Menu, menu_id, request.form.get('version', type=int), **values) is None:
+                db.session.rollback()
+                _remove_upload(new_image)
+                flash('다른 관리자가 먼저 메뉴를 수정했습니다. 최신 내용을 확인한 후 다시 저장해주세요.', 'error')
+                status_code = 409
+            else:
+                db.session.commit()
+                get_menu_cache().invalidate()
+                if new_image:
+                    _remove_upload(old_image)
+                
+                flash('메뉴가 수정되었습니다.', 'success')
+                return redirect(url_for('menu.admin_menu'))
+            
+        except Exception as e:
+            db.session.rollback()
+            _remove_upload(new_image)
+            flash(f'메뉴 수정 중 오류가 발생했습니다: {str(e)}', 'error')
+    
+    # 기존 카테고리 목록
+    categories = db.session.query(Menu.category).filter_by(store_id=current_store()).distinct().all()
+    categories = [cat[0] for cat in categories]
+    
+    return render_template('admin/edit_menu.html', menu=menu, categories=categories), status_code
+
+@menu_bp.route('/admin/menu/delete/<int:menu_id>')
+@admin_required
+def delete_menu(menu_id):
+    """메뉴 삭제"""
+    try:
+        menu = store_get_or_404(Menu, menu_id)
+        
+        # 이미지 파일 삭제
+        _remove_upload(menu.image)
+        
+        db.session.delete(menu)
+        db.session.commit()
+        get_menu_cache().invalidate()
+        
+        flash('메뉴가 삭제되었습니다.', 'success')
+        
+    except Exception as e:
+        db.session.rollback()
+        flash(f'메뉴 삭제 중 오류가 발생했습니다: {str(e)}', 'error')
+    
+    return redirect(url_for('menu.admin_menu'))
+
+@menu_bp.route('/admin/menu/toggle_soldout/<int:menu_id>', methods=['POST'])
+@admin_required
+def toggle_soldout(menu_id):
+    """품절 상태 토글"""
+    try:
+        version = (request.get_json(silent=True) or {}).get('version')
+        menu = store_get_or_404(Menu, menu_id)
+        # 재고가 0인 메뉴는 판매중으로 바꿔도 주문할 수 없으므로 재입고로만 판매 재개
+        if menu.is_soldout and menu.stock == 0:
+            return jsonify({'success': False,
+                            'error': '재고가 0인 메뉴입니다. 메뉴 수정에서 재고를 채우면 판매가 재개됩니다.'})
+        row = versioned_update(Menu, menu_id, version, is_soldout=~Menu.is_soldout)
+        if row is None:
+            db.session.rollback()
+            return conflict_response(store_get_or_404(Menu, menu_id))
+        db.session.commit()
+        get_menu_cache().invalidate()
+        
+        db.session.refresh(menu)
+        status = "품절" if menu.is_soldout else "판매중"
+        return jsonify({'success': True, 'status': status, 'is_soldout': menu.is_soldout, 'version': menu.version})
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'error': str(e)})
+
+@menu_bp.route('/admin/menu/update_order', methods=['POST'])
+@admin_required
+def update_menu_order():
+    """메뉴 순서 변경"""
+    try:
+        menu_orders = request.json.get('menu_orders', [])
+        
+        # 순서만 바꾸므로 버전 조건 없이 갱신하되, 열려 있는 수정 화면이 덮어쓰지 않도록 버전은 올림
+        for item in menu_orders:
+            versioned_update(Menu, item['id'], None, display_order=item['order'])
+        
+        db.session.commit()
+        get_menu_cache().invalidate()
+        return jsonify({'success': True})
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'error': str(e)})
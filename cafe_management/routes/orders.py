@@ -0,0 +1,230 @@
+from collections import Counter
+from datetime import datetime
+
+from flask import Blueprint, render_template, request, jsonify
+from sqlalchemy import and_, delete, select, update
+
+from models import db, Order, OrderItem
+from ratelimit import write_admission
+from events import ORDER_DELETED, STATUS_CHANGED, order_snapshot, record_event
+from menu_cache import get_menu_cache
+from order_actions import ORDER_STATUSES, change_order_status, item_quantities, release_items, remove_order
+from pickup import release_slots
+from rollups import day_range, refresh_daily_sales
+from stores import current_store, store_get_or_404
+from utils import admin_required, conflict_response
+
+orders_bp = Blueprint('orders', __name__)
+
+# 일괄 처리 동작 -> (바꿀 상태, 대상이 될 수 있는 현재 상태)
+BULK_STATUS_ACTIONS = {
+    'complete': ('completed', ('pending', 'preparing')),
+    'cancel': ('cancelled', ('pending', 'preparing', 'completed')),
+}
+BULK_MAX_IDS = 1000  # 이보다 많으면 filter 사용
+
+def _bulk_condition(data):
+    """일괄 처리 대상 WHERE 조건 (현재 매장 한정)
+
+    data['order_ids']: 주문 id 목록, 또는 data['filter']: {'status': 상태 목록, 'start_date', 'end_date'}
+    조건 없이 전체 주문을 처리하는 요청은 받지 않습니다 (ValueError).
+    """
+    conditions = [Order.store_id == current_store()]
+    order_ids = data.get('order_ids')
+    if order_ids:
+        if len(order_ids) > BULK_MAX_IDS:
+            raise ValueError(f'한 번에 {BULK_MAX_IDS}개까지 선택할 수 있습니다. 기간 조건을 사용해주세요.')
+        conditions.append(Order.id.in_([int(order_id) for order_id in order_ids]))
+    else:
+        criteria = data.get('filter') or {}
+        statuses = criteria.get('status')
+        if statuses:
+            conditions.append(Order.status.in_([statuses] if isinstance(statuses, str) else statuses))
+        if criteria.get('start_date'):
+            start_date = datetime.strptime(criteria['start_date'], '%Y-%m-%d').date()
+            conditions.append(Order.order_date >= day_range(start_date)[0])
+        if criteria.get('end_date'):
+            end_date = datetime.strptime(criteria['end_date'], '%Y-%m-%d').date()
+            conditions.append(Order.order_date < day_range(end_date)[1])
+        if len(conditions) == 1:
+            raise ValueError('처리할 주문을 선택하거나 기간/상태 조건을 지정해주세요.')
+    return and_(*conditions)
+
+def recent_orders_stmt(store_id, limit=10):
+    """최근 주문 조회 (대시보드 피드, 비동기 피드와 공용)"""
+    return select(Order).where(Order.store_id == store_id).order_by(Order.order_date.desc()).limit(limit)
+
+def recent_orders_response(orders):
+    """최근 주문 피드 응답 본문"""
+    orders_data = []
+    for order in orders:
+        orders_data.append({
+            'id': order.id,
+            'order_date': order.order_date.strftime('%Y-%m-%d %H:%M'),
+            'customer_name': order.customer_name,
+            'total_amount': order.total_amount,
+            'status': order.status,
+            'delivery_location': order.delivery_location,
+            'pickup_slot': order.pickup_slot.isoformat() if order.pickup_slot else None,
+            'version': order.version
+        })
+    return {'success': True, 'orders': orders_data}
+
+@orders_bp.route('/admin/get_recent_orders')
+@admin_required
+def get_recent_orders():
+    """최근 주문 조회 (AJAX)"""
+    try:
+        orders = db.session.execute(recent_orders_stmt(current_store())).scalars().all()
+        return jsonify(recent_orders_response(orders))
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)})
+
+@orders_bp.route('/admin/update_order_status/<int:order_id>', methods=['POST'])
+@admin_required
+@write_admission
+def update_order_status(order_id):
+    """주문 상태 업데이트 (AJAX)"""
+    try:
+        data = request.get_json(silent=True) or {}
+        new_status = data.get('status')
+        
+        if new_status in ORDER_STATUSES:
+            order = store_get_or_404(Order, order_id)
+            old_status = order.status
+            row, availability = change_order_status(order, new_status, data.get('version'))
+            if row is None:
+                db.session.rollback()
+                return conflict_response(store_get_or_404(Order, order_id))
+            db.session.commit()
+            record_event(STATUS_CHANGED, order_id, **{'from': old_status, 'to': new_status, 'version': row.version})
+            if availability:
+                get_menu_cache().update_availability(availability)
+            
+            return jsonify({'success': True, 'status': new_status, 'version': row.version})
+        else:
+            return jsonify({'success': False, 'error': '잘못된 상태값입니다.'})
+            
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'error': str(e)})
+
+@orders_bp.route('/admin/delete_order/<int:order_id>', methods=['POST'])
+@admin_required
+@write_admission
+def delete_order(order_id):
+    """주문 삭제 (AJAX)"""
+    try:
+        snapshot, availability = remove_order(store_get_or_404(Order, order_id))
+        db.session.commit()
+        record_event(ORDER_DELETED, order_id, **snapshot)
+        if availability:
+            get_menu_cache().update_availability(availability)
+        
+        return jsonify({'success': True})
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'error': str(e)})
+
+@orders_bp.route('/admin/orders/bulk_status', methods=['POST'])
+@admin_required
+@write_admission
+def bulk_update_order_status():
+    """주문 일괄 완료/취소 (AJAX)
+
+    대상 주문 전체를 UPDATE ... RETURNING 한 문장으로 바꾸고, 취소할 때의 재고/픽업 시간대 반환도
+    메뉴/시간대마다 한 번씩만 실행합니다. 이미 그 상태이거나 바꿀 수 없는 상태(취소된 주문의 완료 등)인 주문은 건너뜁니다.
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        if data.get('action') not in BULK_STATUS_ACTIONS:
+            return jsonify({'success': False, 'error': '잘못된 일괄 처리 요청입니다.'})
+        new_status, from_statuses = BULK_STATUS_ACTIONS[data['action']]
+        condition = _bulk_condition(data)
+        
+        rows = db.session.execute(
+            update(Order)
+            .where(condition, Order.status.in_(from_statuses))
+            .values(status=new_status, version=Order.version + 1, updated_at=datetime.now())
+            .returning(Order.id, Order.version, Order.pickup_slot),
+            execution_options={'synchronize_session': False}
+        ).all()
+        
+        # 취소된 주문의 재고와 픽업 시간대 수용량 반환 (대상은 모두 취소 전 상태)
+        availability = {}
+        if new_status == 'cancelled':
+            availability = release_items(item_quantities(row.id for row in rows))
+            release_slots(Counter(row.pickup_slot for row in rows if row.pickup_slot))
+        db.session.commit()
+        for row in rows:
+            record_event(STATUS_CHANGED, row.id, to=new_status, version=row.version, bulk=True)
+        if availability:
+            get_menu_cache().update_availability(availability)
+        
+        return jsonify({'success': True, 'status': new_status, 'count': len(rows),
+                        'orders': [{'id': row.id, 'version': row.version} for row in rows]})
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'error': str(e)})
+
+@orders_bp.route('/admin/orders/bulk_delete', methods=['POST'])
+@admin_required
+@write_admission
+def bulk_delete_orders():
+    """주문 일괄 삭제 (AJAX)
+
+    주문항목은 ORM cascade로 하나씩 불러오지 않고 DELETE ... WHERE order_id IN (SELECT ...) 한 문장으로,
+    주문은 DELETE ... RETURNING 한 문장으로 삭제합니다.
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        condition = _bulk_condition(data)
+        
+        items = db.session.execute(
+            delete(OrderItem).where(OrderItem.order_id.in_(select(Order.id).where(condition)))
+            .returning(OrderItem.order_id, OrderItem.menu_id, OrderItem.quantity),
+            execution_options={'synchronize_session': False}
+        ).all()
+        rows = db.session.execute(
+            delete(Order).where(condition)
+            .returning(Order.id, Order.order_date, Order.status, Order.total_amount,
+                       Order.customer_name, Order.pickup_slot),
+            execution_options={'synchronize_session': False}
+        ).all()
+        
+        # 취소되지 않은 주문의 재고와 픽업 시간대 수용량 반환
+        active_ids = {row.id for row in rows if row.status != 'cancelled'}
+        quantities = Counter()
+        for item in items:
+            if item.order_id in active_ids:
+                quantities[item.menu_id] += item.quantity
+        availability = release_items(quantities)
+        release_slots(Counter(row.pickup_slot for row in rows if row.pickup_slot and row.status != 'cancelled'))
+        refresh_daily_sales({row.order_date.date() for row in rows})
+        db.session.commit()
+        for row in rows:
+            record_event(ORDER_DELETED, row.id, bulk=True, **order_snapshot(row))
+        if availability:
+            get_menu_cache().update_availability(availability)
+        
+        return jsonify({'success': True, 'count': len(rows), 'order_ids': [row.id for row in rows]})
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'error': str(e)})
+
+
+# ====================== 영수증 출력 ======================
+
+@orders_bp.route('/admin/print_receipt/<int:order_id>')
+@admin_required
+def print_receipt(order_id):
+    """영수증 출력"""
+    order = store_get_or_404(Order, order_id)
+    return render_template('admin/receipt.html', order=order)
+
+@orders_bp.route('/admin/print_receipt_small/<int:order_id>')
+@admin_required
+def print_receipt_small(order_id):
+    """작은 영수증 출력"""
+    order = store_get_or_404(Order, order_id)
+    return render_template('admin/receipt_small.html', order=order)
@@ -0,0 +1,255 @@
+from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify
+
+from models import db, Menu, Order, OrderItem
+from cart import encode_item, get_cart, resolve_cart, save_cart
+from events import ORDER_CREATED, order_snapshot, record_event
+from menu_cache import get_menu_cache
+from pickup import available_slots, book_slot, parse_slot, slot_label
+from ratelimit import rate_limit, write_admission
+from rollups import refresh_daily_sales
+from stores import current_store, store_get_or_404
+from utils import reserve_stock
+
+user_bp = Blueprint('user', __name__)
+
+def _int_or_none(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+def menu_search_args(args):
+    """메뉴 검색/필터 조건 (쿼리스트링 -> MenuSnapshot.search 인자, 비동기 피드와 공용)"""
+    return {
+        'query': args.get('q', '').strip(),
+        'category': args.get('category', ''),
+        'temperature': args.get('temperature', ''),
+        'min_price': _int_or_none(args.get('min_price')),
+        'max_price': _int_or_none(args.get('max_price')),
+        'available_only': args.get('available') == '1',
+    }
+
+def menu_search_response(snapshot, args):
+    """메뉴 검색 API 응답 본문"""
+    menus = snapshot.search(**menu_search_args(args))
+    return {'success': True, 'count': len(menus), 'menus': [menu._asdict() for menu in menus]}
+
+@user_bp.route('/user/menu')
+def user_menu():
+    """메뉴 조회 (메뉴 캐시 검색)"""
+    search = menu_search_args(request.args)
+    snapshot = get_menu_cache().get(db.session)
+    menus = snapshot.search(**search)
+    
+    return render_template('user/menu.html', menus=menus, categories=snapshot.categories,
+                           selected_category=search['category'], search=search)
+
+@user_bp.route('/user/api/menu/search')
+def search_menu():
+    """메뉴 검색 API"""
+    return jsonify(menu_search_response(get_menu_cache().get(db.session), request.args))
+
+@user_bp.route('/user/add_to_cart', methods=['POST'])
+@rate_limit('cart')
+def add_to_cart():
+    """장바구니에 추가"""
+    try:
+        menu_id = int(request.form['menu_id'])
+        quantity = int(request.form['quantity'])
+        temperature = request.form.get('temperature', 'ice')
+        special_request = request.form.get('special_request', '')
+        
+        menu = store_get_or_404(Menu, menu_id)
+        
+        if menu.is_soldout:
+            flash('품절된 메뉴입니다.', 'error')
+            return redirect(url_for('user.user_menu'))
+        
+        cart = get_cart()
+        
+        # 재고 확인 (장바구니에 이미 담은 수량 포함, 실제 차감은 주문 시)
+        if menu.stock is not None:
+            in_cart = sum(item[1] for item in cart if item[0] == menu_id)
+            if in_cart + quantity > menu.stock:
+                flash(f'{menu.name}의 남은 재고가 {menu.stock}개입니다.', 'error')
+                return redirect(url_for('user.user_menu'))
+        
+        # 기존 아이템이 있는지 확인 (같은 메뉴, 같은 온도, 같은 요청사항)
+        cart_item = encode_item(menu_id, quantity, temperature, special_request)
+        existing_item = None
+        for item in cart:
+            if item[0] == menu_id and item[2:] == cart_item[2:]:
+                existing_item = item
+                break
+        
+        if existing_item:
+            existing_item[1] += quantity
+        else:
+            cart.append(cart_item)
+        
+        save_cart(cart)
+        flash(f'{menu.name}이(가) 장바구니에 추가되었습니다.', 'success')
+        
+    except Exception as e:
+        flash(f'장바구니 추가 중 오류가 발생했습니다: {str(e)}', 'error')
+    
+    return redirect(url_for('user.user_menu'))
+
+@user_bp.route('/user/view_cart')
+def view_cart():
+    """장바구니 조회"""
+    cart = get_cart()
+    snapshot = get_menu_cache().get(db.session)
+    
+    # 삭제된 메뉴는 장바구니에서 제거 (수정/삭제 폼의 index가 세션 목록과 맞도록)
+    kept = [item for item in cart if item[0] in snapshot.by_id]
+    if len(kept) != len(cart):
+        save_cart(kept)
+    items = resolve_cart(kept, snapshot)
+    total_amount = sum(item['subtotal'] for item in items)
+    
+    return render_template('user/cart.html', cart=items, total_amount=total_amount)
+
+@user_bp.route('/user/update_cart', methods=['POST'])
+def update_cart():
+    """장바구니 수정"""
+    try:
+        action = request.form.get('action')
+        index = int(request.form.get('index'))
+        cart = get_cart()
+        
+        if 0 <= index < len(cart):
+            menu = get_menu_cache().get(db.session).by_id.get(cart[index][0])
+            menu_name = menu.name if menu else '메뉴'
+            quantity = int(request.form.get('quantity', 1)) if action == 'update' else 0
+            if action == 'update' and quantity > 0:
+                cart[index][1] = quantity
+                flash('수량이 업데이트되었습니다.', 'success')
+            elif action in ('remove', 'update'):
+                cart.pop(index)
+                flash(f'{menu_name}이(가) 장바구니에서 제거되었습니다.', 'success')
+        
+        save_cart(cart)
+        
+    except Exception as e:
+        flash(f'장바구니 업데이트 중 오류가 발생했습니다: {str(e)}', 'error')
+    
+    return redirect(url_for('user.view_cart'))
+
+@user_bp.route('/user/place_order', methods=['POST'])
+@rate_limit('checkout')
+@write_admission
+def place_order():
+    """주문하기"""
+    try:
+        # 메뉴 이름/가격은 주문 시점의 메뉴 기준
+        stored_cart = get_cart()
+        cart = resolve_cart(stored_cart, get_menu_cache().get(db.session))
+        if not stored_cart:
+            flash('장바구니가 비어있습니다.', 'error')
+            return redirect(url_for('user.view_cart'))
+        if len(cart) != len(stored_cart):
+            flash('판매가 종료된 메뉴가 장바구니에서 제외되었습니다. 확인 후 다시 주문해주세요.', 'error')
+            return redirect(url_for('user.view_cart'))
+        
+        customer_name = request.form['customer_name']
+        delivery_location = request.form['delivery_location']
+        delivery_time = request.form.get('delivery_time', '')
+        order_request = request.form.get('order_request', '')
+        
+        if not customer_name or not delivery_location:
+            flash('고객명과 배달 위치는 필수입니다.', 'error')
+            return redirect(url_for('user.view_cart'))
+        
+        # 픽업 시간대 (선택사항 - 비우면 즉시 준비)
+        pickup_slot = None
+        if request.form.get('pickup_slot'):
+            pickup_slot = parse_slot(request.form['pickup_slot'])
+            if pickup_slot is None:
+                flash('선택한 픽업 시간은 예약할 수 없습니다. 다시 선택해주세요.', 'error')
+                return redirect(url_for('user.view_cart'))
+            delivery_time = slot_label(pickup_slot)
+        
+        total_amount = sum(item['subtotal'] for item in cart)
+        
+        # 주문 생성
+        order = Order(
+            store_id=current_store(),
+            customer_name=customer_name,
+            delivery_location=delivery_location,
+            delivery_time=delivery_time,
+            pickup_slot=pickup_slot,
+            order_request=order_request,
+            total_amount=int(total_amount),
+            status='pending'
+        )
+        
+        # 재고 차감 (메뉴별 조건부 UPDATE 한 번 - 품절이거나 재고가 부족하면 주문 전체 취소)
+        quantities = {}
+        for item in cart:
+            quantities[item['menu_id']] = quantities.get(item['menu_id'], 0) + item['quantity']
+        availability = {}
+        for menu_id, quantity in quantities.items():
+            row = reserve_stock(menu_id, quantity)
+            if row is None:
+                db.session.rollback()
+                menu_name = next(item['menu_name'] for item in cart if item['menu_id'] == menu_id)
+                flash(f'{menu_name}이(가) 품절되었거나 재고가 부족합니다. 장바구니를 수정해주세요.', 'error')
+                return redirect(url_for('user.view_cart'))
+            if row.stock is not None:
+                availability[row.id] = (row.stock, row.is_soldout)
+        
+        # 픽업 시간대 예약 (수용량이 남아 있을 때만)
+        if pickup_slot is not None and book_slot(pickup_slot) is None:
+            db.session.rollback()
+            flash(f'{slot_label(pickup_slot)} 픽업 시간대가 마감되었습니다. 다른 시간을 선택해주세요.', 'error')
+            return redirect(url_for('user.view_cart'))
+        
+        db.session.add(order)
+        db.session.flush()  # order.id를 얻기 위해
+        
+        # 주문 항목 생성
+        for item in cart:
+            order_item = OrderItem(
+                order_id=order.id,
+                menu_id=item['menu_id'],
+                quantity=item['quantity'],
+                subtotal=item['subtotal'],
+                temperature=item['temperature'],
+                special_request=item['special_request']
+            )
+            db.session.add(order_item)
+        
+        db.session.flush()
+        refresh_daily_sales([order.order_date.date()])
+        order_id, snapshot = order.id, order_snapshot(order)
+        db.session.commit()
+        record_event(ORDER_CREATED, order_id, **snapshot)
+        if availability:
+            get_menu_cache().update_availability(availability)
+        
+        # 장바구니 비우기
+        save_cart([])
+        
+        flash(f'주문이 완료되었습니다. 주문번호: {order_id}', 'success')
+        return redirect(url_for('main.index'))
+        
+    except Exception as e:
+        db.session.rollback()
+        flash(f'주문 처리 중 오류가 발생했습니다: {str(e)}', 'error')
+        return redirect(url_for('user.view_cart'))
+
+@user_bp.route('/user/api/pickup_slots')
+def get_pickup_slots():
+    """예약 가능한 픽업 시간대와 남은 수량 (장바구니 화면용)"""
+    try:
+        return jsonify({'success': True, 'slots': available_slots()})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)})
+
+@user_bp.route('/user/clear_cart', methods=['POST'])
+def clear_cart():
+    """장바구니 비우기"""
+    save_cart([])
+    flash('장바구니가 비워졌습니다.', 'success')
+    return redirect(url_for('user.view_cart'))
@@ -0,0 +1,72 @@
+"""매장(store) 구분과 매장별 DB 분리
+
+- 메뉴/주문/일별 매출에는 store_id가 있고, 요청마다 현재 매장(g.store_id) 기준으로 조회/저장합니다.
+  현재 매장은 세션에 저장되며 아무 페이지에서나 ?store=<매장 ID>로 바꿀 수 있습니다.
+- STORE_SHARDING = True이면 매장마다 instance 폴더의 STORE_DB_PATH 파일을 따로 사용하고,
+  db.session은 현재 매장의 DB로 연결됩니다 (models.StoreSession).
+- 매장 간 보고서는 매장 DB(샤드)마다 스레드 하나씩 병렬로 조회합니다.
+"""
+import os
+
+from flask import current_app, g, request, session, abort
+from sqlalchemy import create_engine
+
+from cart import save_cart
+from models import db
+from migrations import upgrade
+
+def store_names():
+    """{매장 ID: 매장 이름}"""
+    return current_app.config['STORES']
+
+def current_store():
+    """현재 매장 ID (요청 밖에서는 기본 매장)"""
+    return g.get('store_id') or current_app.config['DEFAULT_STORE']
+
+def select_store():
+    """요청마다 현재 매장 결정 (before_request)"""
+    requested = request.args.get('store')
+    if requested is not None:
+        if requested not in store_names():
+            abort(404)
+        if session.get('store_id', current_app.config['DEFAULT_STORE']) != requested:
+            # 장바구니의 메뉴는 매장별이므로 매장을 바꾸면 비움
+            save_cart([])
+        session['store_id'] = requested
+    store_id = session.get('store_id')
+    g.store_id = store_id if store_id in store_names() else current_app.config['DEFAULT_STORE']
+
+def store_engine(store_id=None):
+    """매장 DB 엔진 (STORE_SHARDING이 아니면 모든 매장이 기본 엔진을 공유)"""
+    if not current_app.config['STORE_SHARDING']:
+        return db.engine
+    store_id = store_id or current_store()
+    engines = current_app.extensions.setdefault('store_engines', {})
+    engine = engines.get(store_id)
+    if engine is None:
+        path = os.path.join(current_app.instance_path, current_app.config['STORE_DB_PATH'].format(store=store_id))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        engine = engines.setdefault(store_id, create_engine(f'sqlite:///{path}'))
+    return engine
+
+def store_shards():
+    """[(엔진, 해당 엔진의 매장 ID 목록)] - 분리하지 않으면 기본 엔진 하나에 전체 매장"""
+    if not current_app.config['STORE_SHARDING']:
+        return [(db.engine, list(store_names()))]
+    return [(store_engine(store_id), [store_id]) for store_id in store_names()]
+
+def store_get_or_404(model, row_id):
+    """현재 매장의 행 조회 (다른 매장의 id로 접근하면 404)"""
+    obj = db.session.get(model, row_id)
+    if obj is None or obj.store_id != current_store():
+        abort(404)
+    return obj
+
+def upgrade_stores(target=None):
+    """모든 매장 DB에 마이그레이션 적용 -> [(매장 ID 목록, 적용된 (버전, 설명) 목록)]"""
+    results = []
+    for engine, store_ids in store_shards():
+        # 매장별 DB라면 매장 구분 이전의 기존 행은 그 매장 소유
+        store_id = store_ids[0] if current_app.config['STORE_SHARDING'] else current_app.config['DEFAULT_STORE']
+        results.append((store_ids, upgrade(engine, target=target, store_id=store_id)))
+    return results
@@ -0,0 +1,92 @@
+from datetime import datetime
+from functools import wraps
+
+from flask import current_app, session, redirect, url_for, jsonify
+from sqlalchemy import and_, case, or_, update
+
+from models import db, Menu
+from stores import current_store
+
+def allowed_file(filename):
+    """허용된 파일 확장자인지 확인"""
+    return '.' in filename and \
+           filename.rsplit('.', 1)[1].lower() in current_app.config['ALLOWED_EXTENSIONS']
+
+def admin_required(f):
+    """관리자 인증이 필요한 라우트 데코레이터"""
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if not session.get('admin_logged_in'):
+            return redirect(url_for('admin.admin_login'))
+        return f(*args, **kwargs)
+    return decorated_function
+
+def versioned_update(model, row_id, version, **values):
+    """낙관적 동시성 제어 UPDATE
+    
+    UPDATE ... SET version = version + 1 WHERE id = ? AND version = ? 한 번으로 갱신하고,
+    갱신된 행의 새 version을 담은 Row를 반환합니다. 다른 요청이 먼저 수정했으면 None.
+    version이 None이면 버전 조건 없이 갱신합니다 (버전을 보내지 않는 클라이언트 호환).
+    현재 매장의 행만 갱신합니다.
+    """
+    stmt = update(model).where(model.id == row_id, model.store_id == current_store())
+    if version is not None:
+        stmt = stmt.where(model.version == version)
+    values.setdefault('updated_at', datetime.now())
+    stmt = stmt.values(version=model.version + 1, **values).returning(model.version)
+    return db.session.execute(stmt, execution_options={'synchronize_session': False}).first()
+
+def reserve_stock(menu_id, quantity):
+    """재고 차감 (주문 시)
+    
+    품절이 아니고 재고가 충분할 때만 UPDATE ... SET stock = stock - ? 한 번으로 차감하고,
+    재고가 0이 되면 같은 UPDATE에서 품절로 표시합니다. 차감된 행의 (id, stock, is_soldout, version)
+    Row를 반환하며, 품절이거나 재고가 부족하면 None. 재고를 관리하지 않는 메뉴(stock IS NULL)는 품절 여부만 확인합니다.
+    
+    차감만으로는 version/updated_at을 바꾸지 않아 관리자의 메뉴 수정과 충돌하지 않고,
+    자동 품절로 바뀔 때만 version을 올립니다.
+    """
+    becomes_soldout = and_(Menu.stock.isnot(None), Menu.stock - quantity <= 0)
+    stmt = (
+        update(Menu)
+        .where(Menu.id == menu_id,
+               Menu.store_id == current_store(),
+               Menu.is_soldout.isnot(True),
+               or_(Menu.stock.is_(None), Menu.stock >= quantity))
+        .values(stock=Menu.stock - quantity,
+                is_soldout=becomes_soldout,
+                version=Menu.version + case((becomes_soldout, 1), else_=0),
+                updated_at=case((becomes_soldout, datetime.now()), else_=Menu.updated_at))
+        .returning(Menu.id, Menu.stock, Menu.is_soldout, Menu.version)
+    )
+    return db.session.execute(stmt, execution_options={'synchronize_session': False}).first()
+
+def release_stock(menu_id, quantity):
+    """재고 반환 (주문 취소/삭제 시, reserve_stock의 반대)
+
+    UPDATE ... SET stock = stock + ? 한 번으로 되돌리고, 재고가 0이어서 자동 품절된 메뉴만
+    같은 UPDATE에서 품절을 해제합니다 (재고가 남아 있는데 관리자가 품절 처리한 메뉴는 그대로 둠).
+    반환된 행의 (id, stock, is_soldout, version) Row를 반환하며, 재고를 관리하지 않거나 삭제된 메뉴는 None.
+    """
+    clears_soldout = and_(Menu.is_soldout.is_(True), Menu.stock <= 0)
+    stmt = (
+        update(Menu)
+        .where(Menu.id == menu_id,
+               Menu.store_id == current_store(),
+               Menu.stock.isnot(None))
+        .values(stock=Menu.stock + quantity,
+                is_soldout=case((clears_soldout, False), else_=Menu.is_soldout),
+                version=Menu.version + case((clears_soldout, 1), else_=0),
+                updated_at=case((clears_soldout, datetime.now()), else_=Menu.updated_at))
+        .returning(Menu.id, Menu.stock, Menu.is_soldout, Menu.version)
+    )
+    return db.session.execute(stmt, execution_options={'synchronize_session': False}).first()
+
+def conflict_response(obj):
+    """버전 충돌 응답 (409) - 클라이언트가 최신 상태로 화면을 갱신할 수 있도록 현재 값을 함께 반환"""
+    return jsonify({
+        'success': False,
+        'conflict': True,
+        'error': '다른 관리자가 먼저 변경했습니다. 최신 상태를 확인한 후 다시 시도해주세요.',
+        'current': obj.to_dict()
+    }), 409